@@ -0,0 +1,150 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from formula import PackedFormula, as_formula
+from sat import CDCL
+
+
+# Normal form of a clause set: literals sorted and deduplicated within each
+# clause, duplicate clauses dropped, clauses sorted. Formulas that differ only
+# in clause or literal order share one normal form.
+def normalize(clauses):
+    formula = as_formula(clauses)
+    unique = sorted(set(tuple(sorted(set(clause))) for clause in formula))
+    return PackedFormula.from_literals(unique, formula.num_vars)
+
+
+# Hash of a normalized formula, used as the cache key
+def canonical_key(formula):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(formula.lits.tobytes())
+    digest.update(formula.offsets.tobytes())
+    return digest.hexdigest()
+
+
+# Least recently used cache of (result, assignment) by canonical key.
+# Only definitive results are stored: a model holds for every solver, but
+# False is a proof of unsatisfiability only from a complete solver (pass
+# complete=False otherwise), and an UNKNOWN from a stopped search is none.
+class ResultCache:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, result, assignment, complete=True):
+        if result is None or (result is False and not complete):
+            return
+        self.entries[key] = (result, assignment)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+# Solves a stream of independent formulas on a process pool. Formulas are
+# normalized and looked up in the cache first; the rest are sent to the
+# workers in chunks of `chunk_size` to keep pickling overhead low. At most
+# `max_pending` chunks are in flight, so an unbounded input stream is read
+# lazily. `solver` is a SATAlgorithm class, built as solver(formula, **kwargs)
+# and given `limits` (a limits.Limits) for every formula.
+class BatchSolver:
+    def __init__(self, solver=CDCL, max_workers=None, chunk_size=16, cache=None, limits=None,
+                 max_pending=None, **kwargs):
+        self.solver = solver
+        self.kwargs = kwargs
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.cache = ResultCache() if cache is None else cache
+        self.limits = limits
+        self.max_pending = max_pending
+
+    # Yields one result dict per input formula as soon as it is known, in
+    # completion order. "Index" is the formula's position in the input.
+    def solve_iter(self, formulas):
+        cache = self.cache
+        waiting = {}  # Canonical key -> input indices waiting for its result
+        max_workers = self.max_workers or os.cpu_count() or 1
+        max_pending = self.max_pending or 2 * max_workers
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        futures = {}
+        chunk = []
+        inputs = enumerate(formulas)
+        exhausted = False
+        try:
+            while True:
+                # Top up the pool before waiting on it
+                while not exhausted and len(futures) < max_pending:
+                    item = next(inputs, None)
+                    if item is None:
+                        exhausted = True
+                    else:
+                        index, clauses = item
+                        formula = normalize(clauses)
+                        key = canonical_key(formula)
+                        cached = cache.get(key)
+                        if cached is not None:
+                            yield self._entry(index, cached[0], cached[1], 0.0, True)
+                            continue
+                        if key in waiting:
+                            waiting[key].append(index)  # Same formula already queued
+                            continue
+                        waiting[key] = [index]
+                        chunk.append((key, formula))
+                    if chunk and (exhausted or len(chunk) >= self.chunk_size):
+                        future = executor.submit(_solve_chunk, self.solver, self.kwargs, self.limits, chunk)
+                        futures[future] = chunk
+                        chunk = []
+                if not futures:
+                    break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del futures[future]
+                    for key, result, assignment, solve_time in future.result():
+                        cache.put(key, result, assignment, self.solver.complete)
+                        for index in waiting.pop(key):
+                            yield self._entry(index, result, assignment, solve_time, False)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # All results in input order
+    def solve_all(self, formulas):
+        results = list(self.solve_iter(formulas))
+        results.sort(key=lambda entry: entry["Index"])
+        return results
+
+    @staticmethod
+    def _entry(index, result, assignment, solve_time, cached):
+        return {
+            "Index": index,
+            "Result": result,
+            "Time": solve_time,
+            "Assignment": assignment,
+            "Cached": cached
+        }
+
+
+def _solve_chunk(solver, kwargs, limits, chunk):
+    results = []
+    for key, formula in chunk:
+        start_time = time.perf_counter()
+        algo = solver(formula, **kwargs)
+        algo.limits = limits
+        result, assignment = algo.solve()
+        results.append((key, result, assignment, time.perf_counter() - start_time))
+    return results
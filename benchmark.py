@@ -0,0 +1,206 @@
+import argparse
+import csv
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+from sat import CDCL, DPLL, GSAT, MaxSAT
+
+KSAT_THRESHOLD = 4.26  # Clause/variable ratio of the random 3-SAT phase transition
+
+
+# Instance families. Each generator returns clauses as lists of (var, bool).
+
+def random_ksat(num_variables, ratio=KSAT_THRESHOLD, k=3, seed=0):
+    rng = random.Random(seed)
+    num_clauses = round(num_variables * ratio)
+    return [[(var, rng.random() < 0.5) for var in rng.sample(range(1, num_variables + 1), k)]
+            for _ in range(num_clauses)]
+
+
+# n + 1 pigeons into n holes: always unsatisfiable, hard for resolution
+def pigeonhole(holes):
+    def var(pigeon, hole):
+        return pigeon * holes + hole + 1
+    clauses = [[(var(p, h), True) for h in range(holes)] for p in range(holes + 1)]
+    for h in range(holes):
+        for p in range(holes + 1):
+            for q in range(p + 1, holes + 1):
+                clauses.append([(var(p, h), False), (var(q, h), False)])
+    return clauses
+
+
+# Color a G(n, p) random graph with the given number of colors
+def graph_coloring(vertices, edge_probability, colors, seed=0):
+    rng = random.Random(seed)
+
+    def var(vertex, color):
+        return vertex * colors + color + 1
+    clauses = [[(var(v, c), True) for c in range(colors)] for v in range(vertices)]
+    for v in range(vertices):
+        for c in range(colors):
+            for d in range(c + 1, colors):
+                clauses.append([(var(v, c), False), (var(v, d), False)])
+    for u in range(vertices):
+        for v in range(u + 1, vertices):
+            if rng.random() < edge_probability:
+                for c in range(colors):
+                    clauses.append([(var(u, c), False), (var(v, c), False)])
+    return clauses
+
+
+def default_suite(quick=False):
+    sizes = (20, 40) if quick else (50, 100, 150)
+    seeds = (0, 1) if quick else (0, 1, 2)
+    suite = []
+    for n in sizes:
+        for seed in seeds:
+            suite.append((f"ksat-{n}-{seed}", "random-3sat", random_ksat(n, seed=seed)))
+    for holes in ((3, 4) if quick else (4, 5, 6)):
+        suite.append((f"php-{holes}", "pigeonhole", pigeonhole(holes)))
+    for seed in seeds:
+        vertices = 15 if quick else 40
+        suite.append((f"color-{vertices}-{seed}", "graph-coloring", graph_coloring(vertices, 0.12, 3, seed)))
+    return suite
+
+
+# CDCL that solves an empty formula first and then receives the clauses in
+# two batches through add_clause(), solving after each: exercises the
+# incremental loading path
+def incremental_cdcl(clauses):
+    algo = CDCL([])
+    algo.solve()
+    half = len(clauses) // 2
+    for clause in clauses[:half]:
+        algo.add_clause(clause)
+    algo.solve()
+    for clause in clauses[half:]:
+        algo.add_clause(clause)
+    return algo
+
+
+def default_solvers(seed=0):
+    return {
+        "DPLL": lambda clauses: DPLL(clauses),
+        "CDCL": lambda clauses: CDCL(clauses),
+        "CDCL-incremental": incremental_cdcl,
+        "Max-SAT": lambda clauses: MaxSAT(clauses, seed=seed),
+        "GSAT": lambda clauses: GSAT(clauses, strategy="walksat", seed=seed),
+    }
+
+
+def _satisfies(clauses, assignment):
+    return all(any(assignment.get(var) == val for var, val in clause) for clause in clauses)
+
+
+# Time each solver `repeats` times on every instance (without tracing), then
+# run it once more under tracemalloc to record peak Python memory
+def run_benchmarks(suite, solvers, repeats=3):
+    results = []
+    for instance, family, clauses in suite:
+        variables = len({var for clause in clauses for var, _ in clause})
+        for name, make in solvers.items():
+            times = []
+            for _ in range(repeats):
+                algo = make(clauses)
+                start = time.perf_counter()
+                result, assignment = algo.solve()
+                times.append(time.perf_counter() - start)
+            stats = algo.stats()
+            tracemalloc.start()
+            make(clauses).solve()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append({
+                "instance": instance,
+                "family": family,
+                "solver": name,
+                "variables": variables,
+                "clauses": len(clauses),
+                "result": result,
+                "verified": (not result) or _satisfies(clauses, assignment),
+                "time_median": statistics.median(times),
+                "time_min": min(times),
+                "times": times,
+                "peak_memory_bytes": peak,
+                **{name: getattr(stats, name) for name in ("decisions", "conflicts", "propagations", "flips")},
+            })
+    return results
+
+
+def write_json(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def write_csv(results, path):
+    fields = [key for key in results[0] if key != "times"] if results else []
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+# Compare against a saved run. A (instance, solver) pair regresses when its
+# median time grew by more than `tolerance` (and by at least `min_delta`
+# seconds, to ignore noise on tiny runs), its answer changed, or its model
+# no longer satisfies the instance.
+def compare(results, baseline, tolerance=0.2, min_delta=0.005):
+    previous = {(row["instance"], row["solver"]): row for row in baseline}
+    regressions = []
+    for row in results:
+        if not row["verified"]:
+            regressions.append((row["instance"], row["solver"], "model does not satisfy the instance"))
+            continue
+        old = previous.get((row["instance"], row["solver"]))
+        if old is None:
+            continue
+        slower = row["time_median"] - old["time_median"]
+        if old["result"] != row["result"] and (row["solver"] in ("DPLL", "CDCL", "CDCL-incremental")):
+            regressions.append((row["instance"], row["solver"], f"result {old['result']} -> {row['result']}"))
+        elif slower > min_delta and row["time_median"] > old["time_median"] * (1 + tolerance):
+            regressions.append((row["instance"], row["solver"],
+                                f"time {old['time_median']:.4f}s -> {row['time_median']:.4f}s"))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the SAT solvers on seeded instance families.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the randomized solvers")
+    parser.add_argument("--quick", action="store_true", help="Small instances only")
+    parser.add_argument("--solvers", nargs="+", help="Subset of solvers to run")
+    parser.add_argument("--json", default="benchmark_results.json", help="JSON output path")
+    parser.add_argument("--csv", help="Optional CSV output path")
+    parser.add_argument("--baseline", help="Earlier JSON results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    solvers = default_solvers(args.seed)
+    if args.solvers:
+        solvers = {name: solvers[name] for name in args.solvers}
+    results = run_benchmarks(default_suite(args.quick), solvers, args.repeats)
+    for row in results:
+        print(f"{row['instance']:<16} {row['solver']:<8} {str(row['result']):<6} "
+              f"{row['time_median']:.4f}s  {row['peak_memory_bytes'] / 1024:.0f} KiB  "
+              f"decisions={row['decisions']} conflicts={row['conflicts']} propagations={row['propagations']}")
+    write_json(results, args.json)
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+        for instance, solver, change in regressions:
+            print(f"REGRESSION {instance} {solver}: {change}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
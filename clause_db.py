@@ -0,0 +1,105 @@
+import sys
+
+from literals import lit_var
+from propagation import TRUE
+
+
+# A learned clause: the literal list plus its quality scores
+class LearntClause(list):
+    __slots__ = ("lbd", "activity")
+
+    def __init__(self, lits, lbd):
+        super().__init__(lits)
+        self.lbd = lbd
+        self.activity = 0.0
+
+
+# Number of distinct decision levels among the literals of a clause
+# (literal block distance)
+def compute_lbd(lits, level):
+    return len({level[lit_var(lit)] for lit in lits})
+
+
+# Storage for learned clauses. Clauses with an LBD up to `glue` are kept
+# forever; every `interval` conflicts (growing by `increment` each time) the
+# worse half of the rest is deleted, ranked by LBD and then by activity.
+class ClauseDatabase:
+    def __init__(self, propagator, glue=2, interval=2000, increment=300, decay=0.999):
+        self.propagator = propagator
+        self.glue = glue
+        self.interval = interval
+        self.increment = increment
+        self.decay = decay
+        self.clause_increment = 1.0
+        self.next_reduce = interval
+        self.learnts = []
+        self.learned = 0
+        self.deleted = 0
+        self.reductions = 0
+        self.proof = None  # proof.DratWriter told about deleted clauses
+
+    def __len__(self):
+        return len(self.learnts)
+
+    # Store and watch a learned clause. lits[0] must be the asserting literal
+    # and lits[1] the literal from the highest remaining decision level.
+    def add(self, lits):
+        clause = LearntClause(lits, compute_lbd(lits, self.propagator.level))
+        self.propagator.attach(clause)
+        self.learnts.append(clause)
+        self.learned += 1
+        self.bump(clause)
+        return clause
+
+    def bump(self, clause):
+        clause.activity += self.clause_increment
+        if clause.activity > 1e20:
+            for learnt in self.learnts:
+                learnt.activity *= 1e-20
+            self.clause_increment *= 1e-20
+
+    def on_conflict(self):
+        self.clause_increment /= self.decay
+
+    def should_reduce(self, conflicts):
+        return conflicts >= self.next_reduce
+
+    def reduce(self):
+        self.reductions += 1
+        self.next_reduce += self.interval + self.reductions * self.increment
+        propagator = self.propagator
+        reason, values = propagator.reason, propagator.values
+        keep, candidates = [], []
+        for clause in self.learnts:
+            locked = values[clause[0]] == TRUE and reason[lit_var(clause[0])] is clause
+            if clause.lbd <= self.glue or locked:
+                keep.append(clause)
+            else:
+                candidates.append(clause)
+        candidates.sort(key=lambda clause: (-clause.lbd, clause.activity))
+        half = len(candidates) // 2
+        removed = {id(clause) for clause in candidates[:half]}
+        keep.extend(candidates[half:])
+        if removed:
+            # One pass over every watch list is cheaper than one remove() per clause
+            for ws in propagator.watches:
+                if ws:
+                    ws[:] = [clause for clause in ws if id(clause) not in removed]
+        self.learnts = keep
+        self.deleted += len(removed)
+        if self.proof is not None:
+            for clause in candidates[:half]:
+                self.proof.delete(clause)
+
+    def stats(self):
+        learnts = self.learnts
+        return {
+            "learnts": len(learnts),
+            "glue": sum(1 for clause in learnts if clause.lbd <= self.glue),
+            "learned": self.learned,
+            "deleted": self.deleted,
+            "reductions": self.reductions,
+            "literals": sum(len(clause) for clause in learnts),
+            "memory_bytes": sum(sys.getsizeof(clause) for clause in learnts),
+            "propagations": self.propagator.propagations,
+        }
@@ -0,0 +1,212 @@
+import importlib
+import mmap
+import re
+
+from formula import PackedFormula, as_formula
+from literals import lit_val, lit_var
+
+CHUNK_SIZE = 1 << 20
+
+# Lines that carry no literals: comments, the problem line and the SATLIB "%" trailer
+SPECIAL_LINE = re.compile(rb"^[ \t]*[cp%].*$", re.M)
+
+# Magic bytes -> module whose open() decompresses the file, imported on first use
+COMPRESSED_OPENERS = {
+    b"\x1f\x8b": "gzip",
+    b"\xfd7zXZ\x00": "lzma",
+    b"BZh": "bz2",
+}
+
+
+# Module that decompresses data starting with `magic`, or None for plain text
+def _decompressor(magic):
+    for prefix, module in COMPRESSED_OPENERS.items():
+        if magic.startswith(prefix):
+            return importlib.import_module(module)
+    return None
+
+
+# First bytes of a binary stream, without consuming them. Buffered streams
+# such as stdin are peeked; others only if they can seek back.
+def _peek_magic(stream):
+    if hasattr(stream, "peek"):
+        return stream.peek(6)[:6]
+    if stream.seekable():
+        position = stream.tell()
+        magic = stream.read(6)
+        stream.seek(position)
+        return magic
+    return b""
+
+
+# Yield the raw file contents in chunks. Plain files are memory-mapped,
+# compressed files and streams (detected by their magic bytes) are
+# decompressed on the fly.
+def _iter_chunks(source, chunk_size, sniff=True):
+    if hasattr(source, "read"):
+        decompressor = _decompressor(_peek_magic(source)) if sniff else None
+        if decompressor is not None:
+            with decompressor.open(source, "rb") as stream:
+                yield from _iter_chunks(stream, chunk_size, sniff=False)
+            return
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+        return
+
+    with open(source, "rb") as f:
+        decompressor = _decompressor(f.read(6))
+        if decompressor is not None:
+            with decompressor.open(source, "rb") as stream:
+                yield from _iter_chunks(stream, chunk_size, sniff=False)
+            return
+        f.seek(0, 2)
+        size = f.tell()
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, size, chunk_size):
+                yield mm[start:start + chunk_size]
+
+
+# Parse a DIMACS CNF file (path or binary file object, either possibly
+# compressed) into a PackedFormula. The input is processed chunk by chunk,
+# so only the packed literal buffer grows with the size of the formula.
+def read_dimacs(source, chunk_size=CHUNK_SIZE):
+    formula = PackedFormula()
+    lits, offsets = formula.lits, formula.offsets
+    num_vars = 0
+    header = None
+    leftover = b""
+    done = False
+    for chunk in _iter_chunks(source, chunk_size):
+        block = leftover + chunk
+        cut = block.rfind(b"\n") + 1  # Only parse complete lines
+        block, leftover = block[:cut], block[cut:]
+        if not block:
+            continue
+        block, header, done = _strip_special_lines(block, header)
+        num_vars = _parse_block(block, lits, offsets, num_vars)
+        if done:
+            break
+    if leftover and not done:
+        block, header, _ = _strip_special_lines(leftover + b"\n", header)
+        num_vars = _parse_block(block, lits, offsets, num_vars)
+    if len(lits) > offsets[-1]:
+        offsets.append(len(lits))  # Last clause without a terminating 0
+
+    if header is not None:
+        num_vars = max(num_vars, header[0])
+    formula.num_vars = num_vars
+    return formula
+
+
+def _strip_special_lines(block, header):
+    if SPECIAL_LINE.search(block) is None:
+        return block, header, False
+    done = False
+    kept = []
+    for line in block.split(b"\n"):
+        stripped = line.strip()
+        if stripped[:1] == b"c":
+            continue
+        if stripped[:1] == b"p":
+            fields = stripped.split()
+            if len(fields) != 4 or fields[1] != b"cnf":
+                raise ValueError(f"Invalid DIMACS problem line: {stripped.decode(errors='replace')}")
+            header = (int(fields[2]), int(fields[3]))
+            continue
+        if stripped[:1] == b"%":
+            done = True
+            break
+        kept.append(line)
+    return b"\n".join(kept), header, done
+
+
+def _parse_block(block, lits, offsets, num_vars):
+    append = lits.append
+    for token in block.split():
+        x = int(token)
+        if x > 0:
+            append(2 * x)
+            if x > num_vars:
+                num_vars = x
+        elif x < 0:
+            append(-2 * x + 1)
+            if -x > num_vars:
+                num_vars = -x
+        else:
+            offsets.append(len(lits))
+    return num_vars
+
+
+def _open_for_writing(path):
+    for suffix, module in ((".gz", "gzip"), (".xz", "lzma"), (".bz2", "bz2")):
+        if path.endswith(suffix):
+            return importlib.import_module(module).open(path, "wb")
+    return open(path, "wb")
+
+
+def _dimacs_lit(lit):
+    return str(lit_var(lit)) if lit_val(lit) else f"-{lit_var(lit)}"
+
+
+# Write clauses (or a PackedFormula) in DIMACS CNF format. The output is
+# compressed when the path ends in .gz, .xz or .bz2.
+def write_dimacs(clauses, path, comments=(), batch_size=10000):
+    formula = as_formula(clauses)
+    with _open_for_writing(path) as f:
+        head = [f"c {comment}\n" for comment in comments]
+        head.append(f"p cnf {formula.num_vars} {len(formula)}\n")
+        f.write("".join(head).encode())
+        lines = []
+        for clause in formula:
+            lines.append(" ".join(map(_dimacs_lit, clause)) + " 0\n")
+            if len(lines) >= batch_size:
+                f.write("".join(lines).encode())
+                lines = []
+        f.write("".join(lines).encode())
+
+
+# Parse a weighted CNF file into a maxsat.WCNF. Both the classic format
+# ("p wcnf vars clauses top", hard clauses weighted >= top) and the 2022
+# format ("h" marks hard clauses, no problem line) are accepted.
+def read_wcnf(source, chunk_size=CHUNK_SIZE):
+    from maxsat import WCNF
+    wcnf = WCNF()
+    top = None
+    leftover = b""
+    for chunk in _iter_chunks(source, chunk_size):
+        block = leftover + chunk
+        cut = block.rfind(b"\n") + 1
+        block, leftover = block[:cut], block[cut:]
+        top = _parse_wcnf_lines(block, wcnf, top)
+    _parse_wcnf_lines(leftover, wcnf, top)
+    return wcnf
+
+
+def _parse_wcnf_lines(block, wcnf, top):
+    for line in block.split(b"\n"):
+        fields = line.split()
+        if not fields or fields[0][:1] in (b"c", b"%"):
+            continue
+        if fields[0] == b"p":
+            if len(fields) < 4 or fields[1] != b"wcnf":
+                raise ValueError(f"Invalid WCNF problem line: {line.decode(errors='replace')}")
+            top = int(fields[4]) if len(fields) > 4 else None
+            continue
+        values = [int(x) for x in fields[1:]]
+        if values and values[-1] == 0:
+            values.pop()
+        lits = [2 * x if x > 0 else -2 * x + 1 for x in values]
+        if fields[0] == b"h":
+            wcnf.add_hard(lits)
+            continue
+        weight = int(fields[0])
+        if top is not None and weight >= top:
+            wcnf.add_hard(lits)
+        else:
+            wcnf.add_soft(lits, weight)
+    return top
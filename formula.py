@@ -0,0 +1,144 @@
+from array import array
+
+from literals import lit_val, lit_var, neg, to_lit
+from propagation import FALSE, TRUE, UNASSIGNED
+
+
+# Compact CNF formula: every literal of every clause in one flat int array,
+# with clause i stored in lits[offsets[i]:offsets[i + 1]]. Literals use the
+# 2*var+sign encoding from literals.py.
+class PackedFormula:
+    def __init__(self, num_vars=0):
+        self.lits = array("i")
+        self.offsets = array("q", [0])
+        self.num_vars = num_vars
+
+    @classmethod
+    def from_clauses(cls, clauses):
+        formula = cls()
+        lits, offsets = formula.lits, formula.offsets
+        num_vars = 0
+        for clause in clauses:
+            for var, val in clause:
+                lits.append(to_lit(var, val))
+                if var > num_vars:
+                    num_vars = var
+            offsets.append(len(lits))
+        formula.num_vars = num_vars
+        return formula
+
+    @classmethod
+    def from_literals(cls, clauses, num_vars=0):
+        formula = cls(num_vars)
+        for clause in clauses:
+            formula.add_clause(clause)
+        return formula
+
+    def add_clause(self, lits):
+        self.lits.extend(lits)
+        self.offsets.append(len(self.lits))
+        for lit in lits:
+            if lit_var(lit) > self.num_vars:
+                self.num_vars = lit_var(lit)
+
+    def copy(self):
+        formula = PackedFormula(self.num_vars)
+        formula.lits.extend(self.lits)
+        formula.offsets = self.offsets[:]
+        return formula
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def clause(self, i):
+        return self.lits[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        lits, offsets = self.lits, self.offsets
+        for i in range(len(offsets) - 1):
+            yield lits[offsets[i]:offsets[i + 1]]
+
+    def num_literals(self):
+        return len(self.lits)
+
+    def nbytes(self):
+        return self.lits.itemsize * len(self.lits) + self.offsets.itemsize * len(self.offsets)
+
+    # Variables occurring in the formula, in order of first appearance
+    def variables(self):
+        return [lit_var(lit) for lit in dict.fromkeys(lit & ~1 for lit in self.lits)]
+
+    def count_satisfied(self, values):
+        lits, offsets = self.lits, self.offsets
+        count = 0
+        start = 0
+        for end in offsets[1:]:
+            for k in range(start, end):
+                if values[lits[k]] == TRUE:
+                    count += 1
+                    break
+            start = end
+        return count
+
+    def unsatisfied(self, values):
+        lits, offsets = self.lits, self.offsets
+        result = []
+        for i in range(len(offsets) - 1):
+            for k in range(offsets[i], offsets[i + 1]):
+                if values[lits[k]] == TRUE:
+                    break
+            else:
+                result.append(i)
+        return result
+
+    def to_clauses(self):
+        return [[(lit_var(lit), lit_val(lit)) for lit in clause] for clause in self]
+
+    # Zero-copy NumPy views of the literal and offset buffers
+    def as_numpy(self):
+        import numpy as np
+        return np.frombuffer(self.lits, dtype=np.int32), np.frombuffer(self.offsets, dtype=np.int64)
+
+
+# Variable assignment backed by a bytearray indexed by literal: a true
+# literal holds TRUE, its negation FALSE, and unassigned literals hold 0
+class Assignment:
+    __slots__ = ("values",)
+
+    def __init__(self, num_vars):
+        self.values = bytearray(2 * num_vars + 2)
+
+    @classmethod
+    def from_dict(cls, assignment, num_vars):
+        result = cls(num_vars)
+        for var, val in assignment.items():
+            result.set(var, val)
+        return result
+
+    def set(self, var, val):
+        lit = to_lit(var, val)
+        self.values[lit] = TRUE
+        self.values[neg(lit)] = FALSE
+
+    def get(self, var):
+        value = self.values[2 * var]
+        if value == UNASSIGNED:
+            return None
+        return value == TRUE
+
+    def flip(self, var):
+        lit = 2 * var
+        self.values[lit], self.values[lit + 1] = self.values[lit + 1], self.values[lit]
+
+    def __contains__(self, var):
+        return self.values[2 * var] != UNASSIGNED
+
+    def to_dict(self, variables):
+        values = self.values
+        return {var: values[2 * var] == TRUE for var in variables if values[2 * var] != UNASSIGNED}
+
+
+def as_formula(clauses):
+    if isinstance(clauses, PackedFormula):
+        return clauses
+    return PackedFormula.from_clauses(clauses)
@@ -1,4 +1,7 @@
 import random
+import sys
+
+from dimacs import write_dimacs
 
 # Parameters for generating a massive dataset
 num_clauses = 1000    # Number of clauses
@@ -14,4 +17,8 @@ def generate_clauses(num_clauses, num_variables):
     return clauses
 
 # Generate the dataset
-clauses = generate_clauses(num_clauses, num_variables)
\ No newline at end of file
+clauses = generate_clauses(num_clauses, num_variables)
+
+# Save the dataset in DIMACS format so it can be reloaded with dimacs.read_dimacs
+output_path = sys.argv[1] if len(sys.argv) > 1 else "data_set.cnf"
+write_dimacs(clauses, output_path, comments=[f"{num_clauses} random clauses over {num_variables} variables"])
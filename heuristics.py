@@ -0,0 +1,180 @@
+from literals import lit_val, lit_var, to_lit
+from propagation import UNASSIGNED
+
+
+# Binary max-heap of variables ordered by an external activity list.
+# pos[var] is the variable's index in the heap (-1 when absent), so both
+# insertion and priority increases cost O(log n).
+class VarHeap:
+    def __init__(self, activity):
+        self.activity = activity
+        self.heap = []
+        self.pos = [-1] * len(activity)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, var):
+        return self.pos[var] >= 0
+
+    def insert(self, var):
+        if self.pos[var] >= 0:
+            return
+        self.pos[var] = len(self.heap)
+        self.heap.append(var)
+        self._sift_up(self.pos[var])
+
+    def pop(self):
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.pos[top] = -1
+        if heap:
+            heap[0] = last
+            self.pos[last] = 0
+            self._sift_down(0)
+        return top
+
+    # Restore the heap after the activity of var increased
+    def increase(self, var):
+        if self.pos[var] >= 0:
+            self._sift_up(self.pos[var])
+
+    def _sift_up(self, i):
+        heap, pos, activity = self.heap, self.pos, self.activity
+        var = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if activity[heap[parent]] >= activity[var]:
+                break
+            heap[i] = heap[parent]
+            pos[heap[i]] = i
+            i = parent
+        heap[i] = var
+        pos[var] = i
+
+    def _sift_down(self, i):
+        heap, pos, activity = self.heap, self.pos, self.activity
+        var = heap[i]
+        size = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and activity[heap[child + 1]] > activity[heap[child]]:
+                child += 1
+            if activity[heap[child]] <= activity[var]:
+                break
+            heap[i] = heap[child]
+            pos[heap[i]] = i
+            i = child
+        heap[i] = var
+        pos[var] = i
+
+
+# Base class for decision heuristics: an activity heap plus phase saving.
+# Solvers call pick() to get the next decision literal, bump() on variables
+# involved in a conflict, on_conflict() once per conflict, and the propagator
+# hands back undone literals through unassign().
+class DecisionHeuristic:
+    def __init__(self, num_vars, variables):
+        self.activity = [0.0] * (num_vars + 1)
+        self.phase = [False] * (num_vars + 1)  # Last value of each variable
+        self.heap = VarHeap(self.activity)
+        for var in variables:
+            self.heap.insert(var)
+
+    # Make room for variables up to num_vars
+    def grow(self, num_vars):
+        extra = num_vars + 1 - len(self.activity)
+        self.activity.extend([0.0] * extra)
+        self.phase.extend([False] * extra)
+        self.heap.pos.extend([-1] * extra)
+
+    def add_variable(self, var):
+        self.heap.insert(var)
+
+    def pick(self, values):
+        heap = self.heap
+        while heap:
+            var = heap.pop()
+            if values[2 * var] == UNASSIGNED:
+                return to_lit(var, self.phase[var])
+        return None
+
+    def unassign(self, lits):
+        phase, heap = self.phase, self.heap
+        for lit in lits:
+            var = lit_var(lit)
+            phase[var] = lit_val(lit)
+            heap.insert(var)
+
+    def bump(self, var):
+        pass
+
+    def on_conflict(self):
+        pass
+
+
+# Static order: variables in order of first appearance, never re-ranked
+class OrderedHeuristic(DecisionHeuristic):
+    def __init__(self, num_vars, variables):
+        super().__init__(num_vars, ())
+        for rank, var in enumerate(variables):
+            self.activity[var] = float(len(variables) - rank)
+            self.heap.insert(var)
+
+
+# Classic VSIDS: bump by one, halve every score every `interval` conflicts
+class VSIDS(DecisionHeuristic):
+    def __init__(self, num_vars, variables, interval=256):
+        super().__init__(num_vars, variables)
+        self.interval = interval
+        self.conflicts = 0
+
+    def bump(self, var):
+        self.activity[var] += 1.0
+        self.heap.increase(var)
+
+    def on_conflict(self):
+        self.conflicts += 1
+        if self.conflicts % self.interval == 0:
+            activity = self.activity
+            for var in range(len(activity)):
+                activity[var] *= 0.5  # Uniform scaling keeps the heap order
+
+
+# Exponential VSIDS (MiniSat): grow the bump increment instead of decaying
+# every score, and rescale when the numbers get too large
+class EVSIDS(DecisionHeuristic):
+    def __init__(self, num_vars, variables, decay=0.95):
+        super().__init__(num_vars, variables)
+        self.decay = decay
+        self.increment = 1.0
+
+    def bump(self, var):
+        activity = self.activity
+        activity[var] += self.increment
+        if activity[var] > 1e100:
+            for v in range(len(activity)):
+                activity[v] *= 1e-100
+            self.increment *= 1e-100
+        self.heap.increase(var)
+
+    def on_conflict(self):
+        self.increment /= self.decay
+
+
+HEURISTICS = {
+    "ordered": OrderedHeuristic,
+    "vsids": VSIDS,
+    "evsids": EVSIDS,
+}
+
+
+def make_heuristic(heuristic, num_vars, variables):
+    if isinstance(heuristic, str):
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown decision heuristic: {heuristic}")
+        return HEURISTICS[heuristic](num_vars, variables)
+    return heuristic(num_vars, variables)
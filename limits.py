@@ -0,0 +1,62 @@
+import os
+import time
+
+UNKNOWN = None  # Solve result when a limit or interrupt stopped the search
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+# Resident memory of this process in MB
+def current_memory_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if peak > 2 ** 32 else peak / 1024  # Bytes on macOS, KB elsewhere
+    return 0.0
+
+
+# Resource limits for one solve() call. Attach with `algo.limits = Limits(...)`:
+#   time_limit: wall-clock seconds
+#   conflicts:  conflicts allowed (DPLL, CDCL)
+#   flips:      flips allowed (local search)
+#   memory_mb:  resident memory ceiling for the whole process
+class Limits:
+    def __init__(self, time_limit=None, conflicts=None, flips=None, memory_mb=None, memory_every=16):
+        self.time_limit = time_limit
+        self.conflicts = conflicts
+        self.flips = flips
+        self.memory_mb = memory_mb
+        self.memory_every = memory_every  # Read memory on every n-th check only
+
+    def start(self, algo):
+        self.deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        stats = algo.stats()
+        self.start_conflicts = stats.conflicts
+        self.start_flips = stats.flips
+        self.checks = 0
+
+    # The name of the first exceeded limit, or None
+    def exceeded(self, algo):
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            return "time"
+        if self.conflicts is not None or self.flips is not None:
+            stats = algo.stats()
+            if self.conflicts is not None and stats.conflicts - self.start_conflicts >= self.conflicts:
+                return "conflicts"
+            if self.flips is not None and stats.flips - self.start_flips >= self.flips:
+                return "flips"
+        self.checks += 1
+        if self.memory_mb is not None and self.checks % self.memory_every == 0:
+            if current_memory_mb() > self.memory_mb:
+                return "memory"
+        return None
+
+    def remaining_time(self):
+        return None if self.deadline is None else self.deadline - time.perf_counter()
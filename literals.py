@@ -0,0 +1,20 @@
+# Integer literal encoding shared by the solver engines.
+# Variable v set to True is literal 2*v, set to False is literal 2*v+1,
+# so the negation of a literal is always lit ^ 1.
+
+
+def to_lit(var, val):
+    return 2 * var + (0 if val else 1)
+
+
+def lit_var(lit):
+    return lit >> 1
+
+
+def lit_val(lit):
+    return not lit & 1
+
+
+def neg(lit):
+    return lit ^ 1
+
@@ -0,0 +1,231 @@
+import random
+
+from literals import lit_var
+from propagation import FALSE, TRUE
+
+
+# Incremental local-search engine shared by the GSAT family of solvers and
+# by maxsat.SATLike. For every clause it keeps the number of true literals
+# and the XOR of the variables of its true literals (which is the only true
+# variable when the count is 1). Clauses carry weights, all 1 unless raised
+# with add_weight(). Per variable it keeps break (weight of the clauses that
+# become unsatisfied by flipping it) and make (weight of the unsatisfied
+# clauses it would fix). With track_improving=True it also keeps the set of
+# improving variables (make > break), which greedy strategies pick from. A
+# flip only visits the clauses containing the flipped variable.
+class LocalSearch:
+    def __init__(self, formula, seed=None, track_improving=False):
+        self.random = random.Random(seed)
+        self.track_improving = track_improving
+        self.num_vars = formula.num_vars
+        self.variables = formula.variables()
+        self.clauses = []
+        self.weight = []
+        self.occurrences = [[] for _ in range(2 * formula.num_vars + 2)]  # Clause indices per literal
+        self.has_empty_clause = False  # No assignment can satisfy the formula
+        for lits in formula:
+            if not len(lits):
+                self.has_empty_clause = True
+                continue
+            self._add_clause(lits)
+        self.values = bytearray(2 * formula.num_vars + 2)
+        self.flips = 0
+
+    # Index of the new non-empty clause, or None for a tautology (always
+    # satisfied, so never stored)
+    def _add_clause(self, lits):
+        clause = list(dict.fromkeys(lits))
+        if any(lit ^ 1 in clause for lit in clause):
+            return None
+        for lit in clause:
+            self.occurrences[lit].append(len(self.clauses))
+        self.clauses.append(clause)
+        self.weight.append(1)
+        return len(self.clauses) - 1
+
+    # Start from the given {var: bool} assignment, random for missing variables
+    def reset(self, assignment=None):
+        rng, values = self.random, self.values
+        for var in self.variables:
+            val = assignment.get(var) if assignment else None
+            if val is None:
+                val = rng.random() < 0.5
+            values[2 * var] = TRUE if val else FALSE
+            values[2 * var + 1] = FALSE if val else TRUE
+
+        num_clauses, weight = len(self.clauses), self.weight
+        self.true_count = [0] * num_clauses
+        self.true_xor = [0] * num_clauses
+        self.break_count = [0] * (self.num_vars + 1)
+        self.make_count = [0] * (self.num_vars + 1)
+        self.unsat = []
+        self.unsat_pos = [-1] * num_clauses
+        self.improving = [] if self.track_improving else None
+        self.improving_pos = [-1] * (self.num_vars + 1)
+        for i, clause in enumerate(self.clauses):
+            for lit in clause:
+                if values[lit] == TRUE:
+                    self.true_count[i] += 1
+                    self.true_xor[i] ^= lit_var(lit)
+            if self.true_count[i] == 0:
+                self._add_unsat(i)
+            elif self.true_count[i] == 1:
+                self.break_count[self.true_xor[i]] += weight[i]
+        if self.track_improving:
+            for var in self.variables:
+                self._rescore(var)
+
+    def score(self, var):
+        return self.make_count[var] - self.break_count[var]
+
+    # Move `var` in or out of the improving set after its counts changed
+    def _rescore(self, var):
+        pos = self.improving_pos
+        if self.make_count[var] > self.break_count[var]:
+            if pos[var] < 0:
+                pos[var] = len(self.improving)
+                self.improving.append(var)
+        elif pos[var] >= 0:
+            improving = self.improving
+            last = improving.pop()
+            if last != var:
+                improving[pos[var]] = last
+                pos[last] = pos[var]
+            pos[var] = -1
+
+    def _add_unsat(self, i):
+        self.unsat_pos[i] = len(self.unsat)
+        self.unsat.append(i)
+        make_count, track, weight = self.make_count, self.track_improving, self.weight[i]
+        for lit in self.clauses[i]:
+            make_count[lit_var(lit)] += weight
+            if track:
+                self._rescore(lit_var(lit))
+
+    def _remove_unsat(self, i):
+        unsat, pos = self.unsat, self.unsat_pos
+        last = unsat.pop()
+        if last != i:
+            unsat[pos[i]] = last
+            pos[last] = pos[i]
+        pos[i] = -1
+        make_count, track, weight = self.make_count, self.track_improving, self.weight[i]
+        for lit in self.clauses[i]:
+            make_count[lit_var(lit)] -= weight
+            if track:
+                self._rescore(lit_var(lit))
+
+    # Raise the weight of clause i by `delta`, keeping make and break in step
+    def add_weight(self, i, delta):
+        self.weight[i] += delta
+        if self.true_count[i] == 0:
+            for lit in self.clauses[i]:
+                self.make_count[lit_var(lit)] += delta
+                if self.track_improving:
+                    self._rescore(lit_var(lit))
+        elif self.true_count[i] == 1:
+            var = self.true_xor[i]
+            self.break_count[var] += delta
+            if self.track_improving:
+                self._rescore(var)
+
+    def flip(self, var):
+        values = self.values
+        new_true = 2 * var if values[2 * var] == FALSE else 2 * var + 1
+        values[new_true], values[new_true ^ 1] = TRUE, FALSE
+        true_count, true_xor, break_count = self.true_count, self.true_xor, self.break_count
+        weight, track = self.weight, self.track_improving
+        for i in self.occurrences[new_true]:
+            true_count[i] += 1
+            true_xor[i] ^= var
+            if true_count[i] == 1:
+                self._remove_unsat(i)
+                break_count[var] += weight[i]
+            elif true_count[i] == 2:
+                other = true_xor[i] ^ var
+                break_count[other] -= weight[i]  # The other literal is no longer critical
+                if track:
+                    self._rescore(other)
+        for i in self.occurrences[new_true ^ 1]:
+            true_count[i] -= 1
+            true_xor[i] ^= var
+            if true_count[i] == 0:
+                self._add_unsat(i)
+                break_count[var] -= weight[i]
+            elif true_count[i] == 1:
+                break_count[true_xor[i]] += weight[i]  # The remaining literal became critical
+                if track:
+                    self._rescore(true_xor[i])
+        if track:
+            self._rescore(var)
+        self.flips += 1
+
+    def random_unsat_clause(self):
+        return self.clauses[self.random.choice(self.unsat)]
+
+    # The current assignment, or the one in `values` (a copy of self.values)
+    def assignment(self, values=None):
+        if values is None:
+            values = self.values
+        return {var: values[2 * var] == TRUE for var in self.variables}
+
+
+# Strategies pick the next variable to flip
+
+# Random walk: any variable of a random unsatisfied clause
+def pick_random(search, noise):
+    return lit_var(search.random.choice(search.random_unsat_clause()))
+
+
+# GSAT with random walk: the improving variable with the best make - break
+# score, or a random-walk step with probability `noise` and whenever no
+# flip improves. Needs a search built with track_improving=True.
+def pick_gsat(search, noise):
+    rng = search.random
+    if not search.improving or rng.random() < noise:
+        return pick_random(search, noise)
+    make_count, break_count = search.make_count, search.break_count
+    best_score, best = None, []
+    for var in search.improving:
+        score = make_count[var] - break_count[var]
+        if best_score is None or score > best_score:
+            best_score, best = score, [var]
+        elif score == best_score:
+            best.append(var)
+    return rng.choice(best)
+
+
+# WalkSAT/SKC: in a random unsatisfied clause take a variable that breaks
+# nothing if there is one, otherwise a random variable with probability
+# `noise` and the one with the fewest breaks otherwise
+def pick_walksat(search, noise):
+    rng = search.random
+    clause = search.random_unsat_clause()
+    break_count = search.break_count
+    best_break, best = None, []
+    for lit in clause:
+        var = lit_var(lit)
+        if best_break is None or break_count[var] < best_break:
+            best_break, best = break_count[var], [var]
+        elif break_count[var] == best_break:
+            best.append(var)
+    if best_break > 0 and rng.random() < noise:
+        return lit_var(rng.choice(clause))
+    return rng.choice(best)
+
+
+# probSAT: choose a variable of a random unsatisfied clause with probability
+# proportional to (1 + break) ** -cb, where `noise` is used as cb
+def pick_probsat(search, noise):
+    clause = search.random_unsat_clause()
+    break_count = search.break_count
+    weights = [(1.0 + break_count[lit_var(lit)]) ** -noise for lit in clause]
+    return lit_var(search.random.choices(clause, weights)[0])
+
+
+STRATEGIES = {
+    "random": (pick_random, 0.0),
+    "gsat": (pick_gsat, 0.2),
+    "walksat": (pick_walksat, 0.5),
+    "probsat": (pick_probsat, 2.3),
+}
@@ -1,16 +1,187 @@
-# This is a sample Python script.
+import argparse
+import sys
+import time
 
-# Press ⌃R to execute it or replace it with your code.
-# Press Double ⇧ to search everywhere for classes, files, tool windows, actions, and settings.
+# Exit codes of the SAT and MaxSAT competitions
+EXIT_CODES = {True: 10, False: 20, None: 0}
+EXIT_OPTIMUM = 30
 
+SOLVERS = ("cdcl", "dpll", "parallel", "portfolio", "gsat", "walksat", "probsat", "maxsat")
+# Names from heuristics.HEURISTICS and restarts.RESTART_POLICIES, listed here
+# so parsing the arguments does not import the solvers
+HEURISTICS = ("ordered", "vsids", "evsids")
+RESTARTS = ("luby", "geometric", "none")
 
-def print_hi(name):
-    # Use a breakpoint in the code line below to debug your script.
-    print(f'Hi, {name}')  # Press ⌘F8 to toggle the breakpoint.
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m main",
+        description="Solve a DIMACS CNF (or WCNF for maxsat) and print competition-format output.")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="DIMACS file, or '-' (the default) for stdin; gzip/xz/bz2 input is detected")
+    parser.add_argument("-s", "--solver", choices=SOLVERS, default="cdcl")
+    parser.add_argument("-t", "--time-limit", type=float, help="Wall-clock seconds")
+    parser.add_argument("--conflicts", type=int, help="Conflict budget (dpll, cdcl, maxsat core)")
+    parser.add_argument("--flips", type=int, help="Flip budget (local search)")
+    parser.add_argument("--memory", type=float, help="Resident memory ceiling in MB")
+    parser.add_argument("--max-flips", type=int, default=1000000, help="Flips per local search run")
+    parser.add_argument("--heuristic", choices=HEURISTICS, default="evsids", help="Decision heuristic for dpll/cdcl")
+    parser.add_argument("--restart", choices=RESTARTS, default="luby", help="Restart policy for cdcl")
+    parser.add_argument("--workers", type=int, help="Processes for parallel/portfolio (default: all cores)")
+    parser.add_argument("--cubes", type=int, default=0, help="Cube-and-conquer split variables for parallel")
+    parser.add_argument("--maxsat-mode", choices=("core", "local", "sample"), default="core")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-preprocess", dest="preprocess", action="store_false",
+                        help="Skip CNF simplification before solving")
+    parser.add_argument("--proof", help="Write a DRAT proof (dpll, cdcl); disables preprocessing")
+    parser.add_argument("--binary-proof", action="store_true", help="Binary DRAT instead of text")
+    parser.add_argument("--verify", action="store_true", help="Check the model against the input")
+    parser.add_argument("--stats", action="store_true", help="Print solver counters as comments")
+    parser.add_argument("--no-model", dest="model", action="store_false", help="Omit the v lines")
+    return parser.parse_args(argv)
 
-# Press the green button in the gutter to run the script.
-if __name__ == '__main__':
-    print_hi('PyCharm')
 
-# See PyCharm help at https://www.jetbrains.com/help/pycharm/
+def comment(text):
+    print(f"c {text}", flush=True)
+
+
+# "v" lines for variables 1..num_vars, wrapped like competition solvers do
+def print_model(assignment, num_vars, width=78):
+    tokens = [str(var) if assignment.get(var, False) else f"-{var}" for var in range(1, num_vars + 1)]
+    line = "v"
+    for token in tokens + ["0"]:
+        if len(line) + 1 + len(token) > width:
+            print(line)
+            line = "v"
+        line += " " + token
+    print(line)
+
+
+def make_limits(args):
+    if all(value is None for value in (args.time_limit, args.conflicts, args.flips, args.memory)):
+        return None
+    from limits import Limits
+    return Limits(args.time_limit, args.conflicts, args.flips, args.memory)
+
+
+def print_stats(algo, solve_time):
+    stats = algo.stats().as_dict()
+    stats["elapsed"] = round(solve_time, 4)
+    for name, value in stats.items():
+        comment(f"{name}: {value}")
+
+
+def solve_sat(args, source):
+    from dimacs import read_dimacs
+    formula = read_dimacs(source)
+    comment(f"{formula.num_vars} variables, {len(formula)} clauses")
+    preprocess = args.preprocess and args.proof is None
+
+    if args.solver == "portfolio":
+        from sat import SATComparison
+        comparison = SATComparison(formula, preprocess)
+        winner = comparison.run_portfolio(timeout=args.time_limit, max_flips=args.max_flips,
+                                          max_workers=args.workers)
+        if winner is None:
+            return None, {}, formula
+        comment(f"answered by {winner['Algorithm']}")
+        return winner["Result"], winner["Assignment"], formula
+
+    simplified, preprocessor = formula, None
+    if preprocess:
+        from preprocess import Preprocessor
+        preprocessor = Preprocessor(formula)
+        simplified = preprocessor.run()
+        comment(f"preprocessed to {len(simplified)} clauses")
+
+    if args.solver == "parallel":
+        from parallel import ParallelCDCL
+        algo = ParallelCDCL(simplified, workers=args.workers, cube_vars=args.cubes, seed=args.seed)
+    elif args.solver == "cdcl":
+        from sat import CDCL
+        algo = CDCL(simplified, restart=args.restart, heuristic=args.heuristic)
+    elif args.solver == "dpll":
+        from sat import DPLL
+        algo = DPLL(simplified, heuristic=args.heuristic)
+    else:
+        from sat import GSAT
+        algo = GSAT(simplified, strategy=args.solver, seed=args.seed)
+    algo.limits = make_limits(args)
+
+    proof = None
+    if args.proof is not None and args.solver in ("cdcl", "dpll"):
+        from proof import DratWriter
+        proof = algo.proof = DratWriter(args.proof, binary=args.binary_proof)
+    start_time = time.perf_counter()
+    try:
+        if args.solver in ("gsat", "walksat", "probsat"):
+            result, assignment = algo.solve(max_flips=args.max_flips)
+        else:
+            result, assignment = algo.solve()
+    finally:
+        if proof is not None:
+            proof.close()
+    if algo.stop_reason is not None:
+        comment(f"stopped: {algo.stop_reason} limit")
+    if args.stats:
+        print_stats(algo, time.perf_counter() - start_time)
+    if result and preprocessor is not None:
+        assignment = preprocessor.reconstruct(assignment)
+    return result, assignment, formula
+
+
+def solve_maxsat(args, source):
+    from dimacs import read_wcnf
+    from sat import MaxSAT
+    wcnf = read_wcnf(source)
+    comment(f"{wcnf.num_vars} variables, {len(wcnf.hard)} hard and {len(wcnf.soft)} soft clauses")
+    reported = []
+
+    def on_improve(cost, assignment):
+        reported.append(cost)
+        print(f"o {cost}", flush=True)
+
+    algo = MaxSAT(wcnf, seed=args.seed, mode=args.maxsat_mode, on_improve=on_improve)
+    algo.limits = make_limits(args)
+    start_time = time.perf_counter()
+    algo.solve(max_flips=args.max_flips)
+    if algo.stop_reason is not None:
+        comment(f"stopped: {algo.stop_reason} limit")
+    if args.stats:
+        print_stats(algo, time.perf_counter() - start_time)
+    if algo.cost is None:
+        infeasible = algo.stop_reason is None and (
+            args.maxsat_mode == "core" or getattr(getattr(algo, "search", None), "infeasible", False))
+        print("s UNSATISFIABLE" if infeasible else "s UNKNOWN")
+        return EXIT_CODES[False] if infeasible else EXIT_CODES[None]
+    if not reported or reported[-1] != algo.cost:
+        print(f"o {algo.cost}")
+    optimum = algo.cost == 0 or (args.maxsat_mode == "core" and algo.stop_reason is None)
+    print("s OPTIMUM FOUND" if optimum else "s SATISFIABLE")
+    if args.model:
+        print_model(algo.assignment, wcnf.num_vars)
+    return EXIT_OPTIMUM if optimum else EXIT_CODES[True]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    source = sys.stdin.buffer if args.input == "-" else args.input
+    try:
+        if args.solver == "maxsat":
+            return solve_maxsat(args, source)
+        result, assignment, formula = solve_sat(args, source)
+    except (OSError, ValueError) as error:
+        print(f"c error: {error}", file=sys.stderr)
+        return 1
+
+    if result and args.verify:
+        from proof import check_model
+        comment("model verified" if check_model(formula, assignment) else "MODEL CHECK FAILED")
+    print({True: "s SATISFIABLE", False: "s UNSATISFIABLE", None: "s UNKNOWN"}[result])
+    if result and args.model:
+        print_model(assignment, formula.num_vars)
+    return EXIT_CODES[result]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
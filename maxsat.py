@@ -0,0 +1,289 @@
+import time
+
+from formula import PackedFormula, as_formula
+from limits import Limits
+from literals import lit_val, lit_var, neg, to_lit
+from local_search import LocalSearch
+
+
+# Weighted partial MaxSAT instance: hard clauses must hold, soft clause i
+# costs weights[i] when falsified
+class WCNF:
+    def __init__(self, hard=None, soft=None, weights=None):
+        self.hard = hard if hard is not None else PackedFormula()
+        self.soft = soft if soft is not None else PackedFormula()
+        self.weights = list(weights or [])
+        self.num_vars = max(self.hard.num_vars, self.soft.num_vars)
+
+    @classmethod
+    def from_clauses(cls, hard=(), soft=()):
+        return cls(as_formula(list(hard)), as_formula([clause for clause, _ in soft]),
+                   [weight for _, weight in soft])
+
+    # Plain MaxSAT: every clause of the formula is soft with weight 1
+    @classmethod
+    def from_formula(cls, clauses):
+        formula = as_formula(clauses)
+        return cls(PackedFormula(formula.num_vars), formula, [1] * len(formula))
+
+    def add_hard(self, lits):
+        self.hard.add_clause(lits)
+        self.num_vars = max(self.num_vars, self.hard.num_vars)
+
+    def add_soft(self, lits, weight=1):
+        self.soft.add_clause(lits)
+        self.weights.append(weight)
+        self.num_vars = max(self.num_vars, self.soft.num_vars)
+
+    def variables(self):
+        return list(dict.fromkeys(self.hard.variables() + self.soft.variables()))
+
+    # Total weight of falsified soft clauses, or None if a hard clause is falsified
+    def cost(self, assignment):
+        def satisfied(clause):
+            return any(assignment.get(lit_var(lit)) == lit_val(lit) for lit in clause)
+        if not all(satisfied(clause) for clause in self.hard):
+            return None
+        return sum(weight for clause, weight in zip(self.soft, self.weights) if not satisfied(clause))
+
+
+# SATLike-style anytime local search on the weighted LocalSearch engine.
+# When the search is stuck in a local optimum the weights of falsified hard
+# clauses grow by `hard_increment` and those of falsified soft clauses by
+# one (up to `soft_bound`), which pushes the search toward feasible, cheaper
+# regions. Every improvement of the best feasible cost is passed to
+# on_improve.
+class SATLike(LocalSearch):
+    def __init__(self, wcnf, seed=None, on_improve=None, hard_increment=1, soft_bound=1000, samples=15):
+        super().__init__(PackedFormula(wcnf.num_vars), seed, track_improving=True)
+        self.wcnf = wcnf
+        self.on_improve = on_improve
+        self.hard_increment = hard_increment
+        self.soft_bound = soft_bound
+        self.samples = samples  # Improving variables sampled per greedy step (best from multiple selections)
+        self.variables = wcnf.variables()
+        self.is_hard = []
+        self.original = []  # Original soft weights (0 for hard clauses)
+        self.infeasible = False  # Empty hard clause
+        self.base_cost = 0  # Weight of empty soft clauses
+        for formula, weights in ((wcnf.hard, None), (wcnf.soft, wcnf.weights)):
+            for i, lits in enumerate(formula):
+                if not len(lits):
+                    if weights is None:
+                        self.infeasible = True
+                    else:
+                        self.base_cost += weights[i]
+                elif self._add_clause(lits) is not None:
+                    self.is_hard.append(weights is None)
+                    self.original.append(0 if weights is None else weights[i])
+        self.best_cost = None
+        self.best_assignment = None
+
+    # Random assignment with every clause weight back at 1
+    def reset(self, assignment=None):
+        self.weight = [1] * len(self.clauses)
+        self.hard_unsat = 0
+        self.soft_cost = self.base_cost
+        super().reset(assignment)
+
+    def _add_unsat(self, i):
+        if self.is_hard[i]:
+            self.hard_unsat += 1
+        self.soft_cost += self.original[i]
+        super()._add_unsat(i)
+
+    def _remove_unsat(self, i):
+        if self.is_hard[i]:
+            self.hard_unsat -= 1
+        self.soft_cost -= self.original[i]
+        super()._remove_unsat(i)
+
+    def _update_weights(self):
+        weight = self.weight
+        for i in self.unsat:
+            if self.is_hard[i]:
+                self.add_weight(i, self.hard_increment)
+            elif weight[i] < self.soft_bound:
+                self.add_weight(i, 1)
+
+    # Best of `samples` random improving variables; when none improves, bump
+    # the weights and take the best variable of a falsified (preferably hard)
+    # clause
+    def _pick(self):
+        rng = self.random
+        if self.improving:
+            return max((rng.choice(self.improving) for _ in range(self.samples)), key=self.score)
+        self._update_weights()
+        hard = [i for i in self.unsat if self.is_hard[i]]
+        clause = self.clauses[rng.choice(hard or self.unsat)]
+        return max((lit_var(lit) for lit in clause), key=self.score)
+
+    # Search until the cost reaches zero or a limit is hit. Returns the best
+    # (cost, assignment) found, cost None if no feasible assignment was seen.
+    # stop() is polled every 256 flips; the search ends once it returns True.
+    def solve(self, max_flips=100000, time_limit=None, stop=None):
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        if self.infeasible:
+            return None, None
+        self.reset()
+        for step in range(max_flips):
+            if not self.hard_unsat and (self.best_cost is None or self.soft_cost < self.best_cost):
+                self.best_cost = self.soft_cost
+                self.best_assignment = self.assignment()
+                if self.on_improve is not None:
+                    self.on_improve(self.best_cost, self.best_assignment)
+            if not self.unsat:
+                break
+            if step % 256 == 0:
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+                if stop is not None and stop():
+                    break
+            self.flip(self._pick())
+        return self.best_cost, self.best_assignment
+
+
+# Clauses of a totalizer over `inputs`: returns (outputs, clauses), where
+# outputs[j] is forced true whenever at least j + 1 inputs are true.
+# new_var() allocates a fresh variable.
+def totalizer(inputs, new_var):
+    clauses = []
+
+    def build(lits):
+        if len(lits) == 1:
+            return list(lits)
+        left = build(lits[:len(lits) // 2])
+        right = build(lits[len(lits) // 2:])
+        outputs = [to_lit(new_var(), True) for _ in range(len(left) + len(right))]
+        for i in range(len(left) + 1):
+            for j in range(len(right) + 1):
+                if i + j == 0:
+                    continue
+                clause = [outputs[i + j - 1]]
+                if i:
+                    clause.append(neg(left[i - 1]))
+                if j:
+                    clause.append(neg(right[j - 1]))
+                clauses.append(clause)
+        return outputs
+
+    return build(list(inputs)), clauses
+
+
+# Core-guided exact MaxSAT (OLL, as in RC2) with weight stratification.
+# Each soft clause gets a selector literal that is assumed true. Every
+# unsatisfiable core raises the lower bound by its minimum weight; its
+# selectors are relaxed through a totalizer whose "at least two false" output
+# becomes a new soft assumption. SAT calls made on higher weight strata
+# produce intermediate models, reported through on_improve. `solver` is an
+# incremental SATAlgorithm class supporting assumptions (CDCL by default).
+# `limits` (a limits.Limits already started by the caller) bounds the whole
+# run and `interrupt_event` is shared with the solver; when either stops a
+# SAT call, solve() returns the best assignment so far and sets stop_reason.
+# The event is checked before every SAT call, since each call's solve()
+# clears it on entry.
+class OLL:
+    def __init__(self, wcnf, solver=None, on_improve=None, limits=None, interrupt_event=None):
+        if solver is None:
+            from sat import CDCL as solver
+        self.wcnf = wcnf
+        self.solver = solver
+        self.on_improve = on_improve
+        self.limits = limits
+        self.interrupt_event = interrupt_event
+        self.stop_reason = None
+        self.lower_bound = 0
+        self.best_cost = None
+        self.best_assignment = None
+        self.sat_calls = 0
+
+    # Limits for the next SAT call: whatever the run has left
+    def _call_limits(self, solver):
+        limits = self.limits
+        conflicts = limits.conflicts
+        if conflicts is not None and solver.propagator is not None:
+            conflicts = max(conflicts - solver.propagator.conflicts, 0)
+        time_limit = limits.remaining_time()
+        if time_limit is not None:
+            time_limit = max(time_limit, 0)
+        return Limits(time_limit, conflicts, memory_mb=limits.memory_mb, memory_every=limits.memory_every)
+
+    def _new_var(self):
+        self.num_vars += 1
+        return self.num_vars
+
+    def solve(self):
+        wcnf = self.wcnf
+        self.num_vars = wcnf.num_vars
+        hard = PackedFormula.from_literals(wcnf.hard, wcnf.num_vars)
+        weights = {}  # Assumption literal -> remaining weight
+        sums = {}  # Sum bound literal -> (totalizer outputs, index of the bounded output)
+        merged = {}  # Identical soft clauses share one selector
+        for lits, weight in zip(wcnf.soft, wcnf.weights):
+            clause = tuple(sorted(set(lits)))
+            if weight > 0 and not any(neg(lit) in clause for lit in clause):
+                merged[clause] = merged.get(clause, 0) + weight
+        for clause, weight in merged.items():
+            if len(clause) == 1:
+                selector = clause[0]
+            else:
+                selector = to_lit(self._new_var(), True)
+                hard.add_clause(list(clause) + [neg(selector)])
+            weights[selector] = weights.get(selector, 0) + weight
+
+        # One incremental solver for the whole run keeps its learned clauses
+        solver = self.solver(hard)
+        if self.interrupt_event is not None:
+            solver.interrupt_event = self.interrupt_event
+        threshold = max(weights.values(), default=0)
+        while True:
+            assumptions = [lit for lit, weight in weights.items() if weight >= threshold]
+            if self.interrupt_event is not None and self.interrupt_event.is_set():
+                self.interrupt_event.clear()
+                self.stop_reason = "interrupted"
+                return self.best_cost, self.best_assignment
+            self.sat_calls += 1
+            if self.limits is not None:
+                solver.limits = self._call_limits(solver)
+            result, model = solver.solve(assumptions=[(lit_var(lit), lit_val(lit)) for lit in assumptions])
+            if result is None:
+                self.stop_reason = solver.stop_reason
+                return self.best_cost, self.best_assignment
+            if result:
+                assignment = {var: model.get(var, False) for var in wcnf.variables()}
+                cost = wcnf.cost(assignment)
+                if self.best_cost is None or cost < self.best_cost:
+                    self.best_cost, self.best_assignment = cost, assignment
+                    if self.on_improve is not None:
+                        self.on_improve(cost, assignment)
+                lower = [weight for weight in weights.values() if 0 < weight < threshold]
+                if not lower:
+                    return self.best_cost, self.best_assignment
+                threshold = max(lower)
+                continue
+
+            core = [to_lit(var, val) for var, val in solver.core]
+            if not core:
+                return None, None  # The hard clauses alone are unsatisfiable
+            min_weight = min(weights[lit] for lit in core)
+            self.lower_bound += min_weight
+            for lit in core:
+                weights[lit] -= min_weight
+                if not weights[lit]:
+                    del weights[lit]
+                if lit in sums:
+                    # A sum bound was violated: allow one more false input
+                    outputs, index = sums[lit]
+                    if index + 1 < len(outputs):
+                        bound = neg(outputs[index + 1])
+                        weights[bound] = weights.get(bound, 0) + min_weight
+                        sums[bound] = (outputs, index + 1)
+            if len(core) == 1:
+                solver.add_clause([(lit_var(core[0]), not lit_val(core[0]))])
+                continue
+            outputs, clauses = totalizer([neg(lit) for lit in core], self._new_var)
+            for clause in clauses:
+                solver.add_clause([(lit_var(lit), lit_val(lit)) for lit in clause])
+            bound = neg(outputs[1])  # At most one of the core's clauses may be false
+            weights[bound] = weights.get(bound, 0) + min_weight
+            sums[bound] = (outputs, 1)
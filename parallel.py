@@ -0,0 +1,269 @@
+import multiprocessing
+import queue
+import random
+import traceback
+from collections import Counter
+
+from clause_db import compute_lbd
+from limits import UNKNOWN
+from literals import lit_var
+from propagation import FALSE, TRUE
+from sat import CDCL, SATAlgorithm
+from stats import SolverStats
+
+# (heuristic, restart policy) of worker i, cycled; workers past the first
+# also start from seeded random phases and activities
+WORKER_CONFIGS = (
+    ("evsids", "luby"),
+    ("evsids", "geometric"),
+    ("vsids", "luby"),
+    ("evsids", "luby"),
+    ("vsids", "geometric"),
+    ("ordered", "luby"),
+)
+
+
+# Learned clauses shared between processes: a ring of ints in shared memory.
+# Each clause is stored as [source worker, length, literals...]; `head`
+# counts the ints ever written. Readers keep their own position and skip
+# ahead when writers have lapped them, so slow readers lose clauses but
+# never block anyone.
+class ClauseRing:
+    def __init__(self, capacity=1 << 16, context=multiprocessing):
+        self.capacity = capacity
+        self.data = context.RawArray("i", capacity)
+        self.head = context.RawValue("q", 0)
+        self.lock = context.Lock()
+
+    def push(self, source, lits):
+        record = [source, len(lits)] + list(lits)
+        if len(record) > self.capacity:
+            return
+        data, capacity = self.data, self.capacity
+        with self.lock:
+            head = self.head.value
+            start = head % capacity
+            end = start + len(record)
+            if end <= capacity:
+                data[start:end] = record
+            else:
+                split = capacity - start
+                data[start:] = record[:split]
+                data[:end - capacity] = record[split:]
+            self.head.value = head + len(record)
+
+    # Clauses written by other workers since `position`. Returns them with
+    # the position to read from next time.
+    def pull(self, reader, position):
+        data, capacity = self.data, self.capacity
+        with self.lock:
+            head = self.head.value
+            if head - position > capacity:
+                return [], head  # Lapped: the unread records were overwritten
+            start, end = position % capacity, head % capacity
+            if head - position == 0:
+                return [], head
+            if start < end:
+                ints = data[start:end]
+            else:
+                ints = data[start:] + data[:end]
+        clauses = []
+        i = 0
+        while i < len(ints):
+            source, length = ints[i], ints[i + 1]
+            if source != reader:
+                clauses.append(ints[i + 2:i + 2 + length])
+            i += 2 + length
+        return clauses, head
+
+
+# CDCL worker that exports its short, low-LBD learned clauses to the ring
+# and imports the other workers' clauses at every restart. Imported clauses
+# join the clause database just above the glue level, so reductions treat
+# them like other recent learned clauses and drop the ones that stay idle.
+class SharingCDCL(CDCL):
+    def __init__(self, clauses, worker=0, ring=None, seed=0, share_lbd=2, share_size=8,
+                 restart="luby", heuristic="evsids"):
+        super().__init__(clauses, restart, heuristic)
+        self.worker = worker
+        self.ring = ring
+        self.seed = seed
+        self.share_lbd = share_lbd
+        self.share_size = share_size
+        self.position = 0
+        self.exported = 0
+        self.imported = 0
+
+    def _init_heuristic(self, num_vars):
+        super()._init_heuristic(num_vars)
+        if not self.seed:
+            return
+        rng = random.Random(self.seed)
+        order = self.order
+        for var in self.formula.variables():
+            order.phase[var] = rng.random() < 0.5
+            order.activity[var] += rng.random() * 1e-3  # Only breaks ties
+            order.heap.increase(var)
+
+    def _analyze(self, conflict):
+        learnt, backjump_level = super()._analyze(conflict)
+        if self.ring is not None and len(learnt) <= self.share_size:
+            if compute_lbd(learnt, self.propagator.level) <= self.share_lbd:
+                self.ring.push(self.worker, learnt)
+                self.exported += 1
+        return learnt, backjump_level
+
+    def _restart(self):
+        super()._restart()
+        if self.ring is None:
+            return True
+        clauses, self.position = self.ring.pull(self.worker, self.position)
+        propagator = self.propagator
+        values = propagator.values
+        for lits in clauses:
+            self.imported += 1
+            if any(values[lit] == TRUE for lit in lits):
+                continue  # Already satisfied at level 0
+            lits = [lit for lit in dict.fromkeys(lits) if values[lit] != FALSE]
+            if not lits:
+                return False
+            if len(lits) == 1:
+                propagator.assign(lits[0])
+            else:
+                self.clause_db.add(lits).lbd = self.clause_db.glue + 1
+        # Imported units must be propagated at level 0, before the next decision
+        return propagator.propagate() is None
+
+
+# Parallel CDCL: `workers` diversified SharingCDCL processes search the same
+# formula and exchange learned clauses through a shared ClauseRing; the
+# first definitive answer wins. With cube_vars=k the search space is split
+# into 2**k cubes over the k most frequent variables (cube-and-conquer):
+# workers take cubes from a queue and solve each under assumptions, and the
+# formula is unsatisfiable once every cube is refuted. The time limit and
+# interrupt() are enforced by this process, which terminates the workers.
+class ParallelCDCL(SATAlgorithm):
+    complete = True
+
+    def __init__(self, clauses, workers=None, cube_vars=0, share_lbd=2, share_size=8,
+                 ring_capacity=1 << 16, seed=0):
+        super().__init__(clauses)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.cube_vars = cube_vars
+        self.share_lbd = share_lbd
+        self.share_size = share_size
+        self.ring_capacity = ring_capacity
+        self.seed = seed
+        self.worker_stats = {}  # Worker -> counters of the workers that reported back
+        self.worker_errors = {}  # Worker -> traceback of the workers that failed
+        self.winner = None
+
+    def stats(self):
+        total = SolverStats()
+        for counters in self.worker_stats.values():
+            for name, value in counters.items():
+                if hasattr(total, name) and isinstance(value, int):
+                    setattr(total, name, getattr(total, name) + value)
+        return total
+
+    # The 2**cube_vars sign combinations over the most frequent variables
+    def cubes(self):
+        counts = Counter(lit_var(lit) for lit in self.formula.lits)
+        variables = [var for var, _ in counts.most_common(self.cube_vars)]
+        return [[(var, bool(mask >> i & 1)) for i, var in enumerate(variables)]
+                for mask in range(1 << len(variables))]
+
+    def solve(self):
+        self._begin_solve()
+        context = multiprocessing.get_context()
+        ring = ClauseRing(self.ring_capacity, context)
+        results = context.Queue()
+        cube_queue = None
+        cubes = self.cubes() if self.cube_vars else []
+        if cubes:
+            cube_queue = context.Queue()
+            for cube in cubes:
+                cube_queue.put(cube)
+            for _ in range(self.workers):
+                cube_queue.put(None)
+        processes = []
+        for worker in range(self.workers):
+            heuristic, restart = WORKER_CONFIGS[worker % len(WORKER_CONFIGS)]
+            config = {"worker": worker, "seed": self.seed + worker, "share_lbd": self.share_lbd,
+                      "share_size": self.share_size, "restart": restart, "heuristic": heuristic}
+            process = context.Process(target=_run_worker, daemon=True,
+                                      args=(self.formula, config, ring, results, cube_queue))
+            process.start()
+            processes.append(process)
+
+        result, self.assignment = UNKNOWN, {}
+        refuted = 0
+        finished = set()  # Workers that stopped without an answer
+        try:
+            while result is UNKNOWN and len(finished) < self.workers:
+                if self._limit_reached():
+                    break
+                # Anything a worker sent before exiting is already in the queue,
+                # so workers that had exited before an empty get() died silently
+                exited = [worker for worker, process in enumerate(processes) if process.exitcode is not None]
+                try:
+                    worker, kind, payload, counters = results.get(timeout=0.05)
+                except queue.Empty:
+                    finished.update(exited)
+                    continue
+                self.worker_stats[worker] = counters
+                if kind == "sat":
+                    result, self.assignment, self.winner = True, payload, worker
+                elif kind == "unsat":
+                    result, self.winner = False, worker
+                elif kind == "cube":
+                    refuted += 1
+                    if refuted == len(cubes):
+                        result, self.winner = False, worker
+                else:
+                    if kind == "error":
+                        self.worker_errors[worker] = payload
+                    finished.add(worker)  # Worker stopped without an answer
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
+        self._end_solve()
+        return result, self.assignment
+
+
+def _run_worker(formula, config, ring, results, cube_queue):
+    algo = SharingCDCL(formula, ring=ring, **config)
+    worker = config["worker"]
+
+    def report(kind, payload=None):
+        counters = SolverStats.collect(algo).as_dict()
+        counters["exported"], counters["imported"] = algo.exported, algo.imported
+        results.put((worker, kind, payload, counters))
+
+    try:
+        _search(algo, report, cube_queue)
+    except Exception:
+        report("error", traceback.format_exc())
+
+
+def _search(algo, report, cube_queue):
+    if cube_queue is None:
+        result, assignment = algo.solve()
+        report("sat" if result else "unsat", assignment)
+        return
+    while True:
+        cube = cube_queue.get()
+        if cube is None:
+            report("done")
+            return
+        result, assignment = algo.solve(assumptions=cube)
+        if result:
+            report("sat", assignment)
+            return
+        if not algo.core:
+            report("unsat")  # Refuted without the cube: the formula itself
+            return
+        report("cube")
@@ -0,0 +1,203 @@
+from formula import PackedFormula, as_formula
+from literals import lit_val, lit_var, neg
+from propagation import UNASSIGNED, Propagator
+
+
+# CNF simplification run before the solvers. Clauses are kept as frozensets
+# of integer literals with occurrence lists per literal. The simplified
+# formula is equisatisfiable with the input; reconstruct() turns a model of
+# it back into a model of the original formula.
+#   - duplicate literals, tautologies and duplicate clauses are dropped
+#   - unit clauses are propagated and their variables fixed
+#   - subsumed clauses are removed and self-subsuming resolution strengthens clauses
+#   - bounded variable elimination removes variables whose resolvents are no
+#     more numerous than the clauses they replace
+#   - failed-literal probing fixes literals whose opposite propagates to a conflict
+class Preprocessor:
+    def __init__(self, clauses, max_occurrences=16, max_resolvent=20, rounds=3, probe=True):
+        self.formula = as_formula(clauses)
+        self.max_occurrences = max_occurrences
+        self.max_resolvent = max_resolvent
+        self.rounds = rounds
+        self.probe = probe
+        self.variables = self.formula.variables()
+        self.fixed = {}  # Variables set by unit clauses and probing
+        self.stack = []  # (pivot literal, clause) pairs removed by variable elimination
+        self.unsat = False
+        self.stats = {"duplicates": 0, "tautologies": 0, "subsumed": 0, "strengthened": 0,
+                      "eliminated": 0, "failed_literals": 0, "fixed": 0}
+
+    def run(self):
+        num_vars = self.formula.num_vars
+        self.clauses = {}  # Clause id -> frozenset of literals
+        self.index = {}  # frozenset of literals -> clause id
+        self.occurrences = [set() for _ in range(2 * num_vars + 2)]
+        self.units = []
+        self.next_id = 0
+        for lits in self.formula:
+            self._add(frozenset(lits), len(lits))
+        self._propagate_units()
+        for _ in range(self.rounds):
+            if self.unsat:
+                break
+            size = (len(self.clauses), sum(len(clause) for clause in self.clauses.values()))
+            self._subsume()
+            self._eliminate()
+            if self.probe:
+                self._probe()
+            if (len(self.clauses), sum(len(clause) for clause in self.clauses.values())) == size:
+                break
+        self.stats["fixed"] = len(self.fixed)
+
+        if self.unsat:
+            return PackedFormula.from_literals([[]], num_vars)
+        return PackedFormula.from_literals([sorted(clause) for clause in self.clauses.values()], num_vars)
+
+    # Extend a model of the simplified formula to the original variables
+    def reconstruct(self, assignment):
+        result = dict(assignment)
+        result.update(self.fixed)
+        for var in self.variables:
+            result.setdefault(var, False)
+        for pivot, clause in reversed(self.stack):
+            if not any(result[lit_var(lit)] == lit_val(lit) for lit in clause):
+                result[lit_var(pivot)] = lit_val(pivot)
+        return {var: result[var] for var in self.variables}
+
+    def _add(self, clause, original_size=None):
+        if original_size is not None and original_size > len(clause):
+            self.stats["duplicates"] += 1  # Repeated literals inside the clause
+        if any(neg(lit) in clause for lit in clause):
+            self.stats["tautologies"] += 1
+            return
+        if clause in self.index:
+            self.stats["duplicates"] += 1
+            return
+        if not clause:
+            self.unsat = True
+            return
+        if len(clause) == 1:
+            self.units.append(next(iter(clause)))
+        cid = self.next_id
+        self.next_id += 1
+        self.clauses[cid] = clause
+        self.index[clause] = cid
+        for lit in clause:
+            self.occurrences[lit].add(cid)
+
+    def _remove(self, cid):
+        clause = self.clauses.pop(cid)
+        del self.index[clause]
+        for lit in clause:
+            self.occurrences[lit].discard(cid)
+        return clause
+
+    # Drop one literal from a clause
+    def _strengthen(self, cid, lit):
+        clause = self._remove(cid)
+        self._add(clause - {lit})
+        self.stats["strengthened"] += 1
+
+    def _propagate_units(self):
+        while self.units and not self.unsat:
+            lit = self.units.pop()
+            var = lit_var(lit)
+            if var in self.fixed:
+                if self.fixed[var] != lit_val(lit):
+                    self.unsat = True
+                continue
+            self.fixed[var] = lit_val(lit)
+            for cid in list(self.occurrences[lit]):
+                self._remove(cid)
+            for cid in list(self.occurrences[neg(lit)]):
+                self._strengthen(cid, neg(lit))
+
+    def _subsume(self):
+        for cid in sorted(self.clauses, key=lambda cid: len(self.clauses[cid])):
+            if self.unsat:
+                return
+            clause = self.clauses.get(cid)
+            if clause is None:
+                continue
+            # Forward subsumption: clause is contained in other clauses
+            pivot = min(clause, key=lambda lit: len(self.occurrences[lit]))
+            for other in list(self.occurrences[pivot]):
+                if other != cid and clause <= self.clauses[other]:
+                    self._remove(other)
+                    self.stats["subsumed"] += 1
+            # Self-subsuming resolution: other = (clause - {lit}) + {-lit} + rest loses -lit
+            for lit in clause:
+                rest = clause - {lit}
+                for other in list(self.occurrences[neg(lit)]):
+                    if other in self.clauses and rest <= self.clauses[other]:
+                        self._strengthen(other, neg(lit))
+                if cid not in self.clauses:
+                    break
+            self._propagate_units()
+
+    def _eliminate(self):
+        occurrences = self.occurrences
+        candidates = [var for var in self.variables if var not in self.fixed]
+        candidates.sort(key=lambda var: len(occurrences[2 * var]) * len(occurrences[2 * var + 1]))
+        for var in candidates:
+            if self.unsat:
+                return
+            pos, negs = list(occurrences[2 * var]), list(occurrences[2 * var + 1])
+            # Either side over the bound makes the resolvent loop too costly;
+            # pure literals have no resolvents and are always eliminated
+            if pos and negs and max(len(pos), len(negs)) > self.max_occurrences:
+                continue
+            resolvents = []
+            pivots = {2 * var, 2 * var + 1}
+            for p in pos:
+                negated = {neg(lit) for lit in self.clauses[p]} - pivots
+                for n in negs:
+                    if not negated.isdisjoint(self.clauses[n]):
+                        continue  # Tautological resolvent
+                    resolvent = (self.clauses[p] | self.clauses[n]) - pivots
+                    resolvents.append(resolvent)
+                    if len(resolvents) > len(pos) + len(negs) or len(resolvent) > self.max_resolvent:
+                        break
+                else:
+                    continue
+                break
+            else:
+                if not pos and not negs:
+                    continue
+                # Elimination does not grow the formula: replace the clauses
+                for cid in pos:
+                    self.stack.append((2 * var, self._remove(cid)))
+                for cid in negs:
+                    self.stack.append((2 * var + 1, self._remove(cid)))
+                for resolvent in resolvents:
+                    self._add(resolvent)
+                self.stats["eliminated"] += 1
+                self._propagate_units()
+
+    def _probe(self):
+        propagator = Propagator(self.formula.num_vars)
+        for clause in self.clauses.values():
+            propagator.add_clause(list(clause))
+        if propagator.propagate() is not None:
+            self.unsat = True
+            return
+        for var in self.variables:
+            if var in self.fixed:
+                continue
+            for lit in (2 * var, 2 * var + 1):
+                if propagator.values[lit] != UNASSIGNED:
+                    continue
+                propagator.new_decision_level()
+                propagator.assign(lit)
+                conflict = propagator.propagate()
+                propagator.backtrack(0)
+                if conflict is not None:
+                    # lit fails, so its negation holds
+                    self.stats["failed_literals"] += 1
+                    propagator.assign(neg(lit))
+                    if propagator.propagate() is not None:
+                        self.unsat = True
+                        return
+        for lit in propagator.trail:
+            self.units.append(lit)
+        self._propagate_units()
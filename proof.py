@@ -0,0 +1,264 @@
+import os
+
+from formula import Assignment, as_formula
+from literals import lit_val, lit_var, neg
+from propagation import FALSE, TRUE, UNASSIGNED, Propagator
+
+
+# Streams a DRAT proof: every clause the solver learns ("a") or deletes
+# ("d"). Attach with `algo.proof = DratWriter(path)` before solve(); the
+# writer is flushed at the end of every solve() and must be closed by the
+# caller. Lines are collected in a buffer and written `buffer_size` bytes at
+# a time. binary=True writes the compact binary DRAT format, whose literal
+# code 2*var + sign is exactly the literal encoding of literals.py.
+class DratWriter:
+    def __init__(self, target, binary=False, buffer_size=1 << 16):
+        if isinstance(target, (str, os.PathLike)):
+            self.file = open(target, "wb")
+            self.owns_file = True
+        else:
+            self.file = target  # Any binary file object
+            self.owns_file = False
+        self.binary = binary
+        self.buffer = bytearray()
+        self.buffer_size = buffer_size
+        self.added = 0
+        self.deleted = 0
+
+    def add(self, lits):
+        self.added += 1
+        self._write(b"a", b"", lits)
+
+    def delete(self, lits):
+        self.deleted += 1
+        self._write(b"d", b"d ", lits)
+
+    def _write(self, binary_tag, text_tag, lits):
+        buffer = self.buffer
+        if self.binary:
+            buffer += binary_tag
+            for lit in lits:
+                while lit > 127:
+                    buffer.append(lit & 127 | 128)
+                    lit >>= 7
+                buffer.append(lit)
+            buffer.append(0)
+        else:
+            buffer += text_tag
+            for lit in lits:
+                buffer += b"%d " % (lit_var(lit) if lit_val(lit) else -lit_var(lit))
+            buffer += b"0\n"
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        if self.owns_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Steps of a DRAT proof as (deleted, lits) pairs. `source` is a path, the
+# proof's bytes, or an iterable of steps (returned as is). Binary proofs are
+# recognised by their first byte ("a", or "d" followed by a non-space) or
+# by non-printable bytes near the start.
+def read_drat(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            source = f.read()
+    if not isinstance(source, (bytes, bytearray)):
+        return list(source)
+    if _is_binary(source):
+        return list(_read_binary(source))
+    return list(_read_text(source))
+
+
+def _is_binary(data):
+    head = data[:32]
+    if head[:1] == b"a" or (head[:1] == b"d" and head[1:2] not in (b" ", b"")):
+        return True
+    return any(byte < 32 and byte not in b"\t\r\n" or byte > 126 for byte in head)
+
+
+def _read_binary(data):
+    i, n = 0, len(data)
+    while i < n:
+        deleted = data[i] == ord("d")
+        i += 1
+        lits = []
+        while True:
+            code, shift = 0, 0
+            while data[i] & 128:
+                code |= (data[i] & 127) << shift
+                shift += 7
+                i += 1
+            code |= data[i] << shift
+            i += 1
+            if not code:
+                break
+            lits.append(code)
+        yield deleted, lits
+
+
+def _read_text(data):
+    for line in data.splitlines():
+        tokens = line.split()
+        if not tokens or tokens[0] == b"c":
+            continue
+        deleted = tokens[0] == b"d"
+        if deleted:
+            tokens = tokens[1:]
+        lits = []
+        for token in tokens:
+            value = int(token)
+            if not value:
+                break
+            lits.append(2 * abs(value) + (value < 0))
+        yield deleted, lits
+
+
+# Clauses of `clauses` that `assignment` (a {var: bool} dict) leaves
+# unsatisfied; unassigned variables satisfy nothing. Vectorized with NumPy
+# when it is installed.
+def falsified_clauses(clauses, assignment):
+    formula = as_formula(clauses)
+    values = Assignment(formula.num_vars)
+    for var, val in assignment.items():
+        if 0 < var <= formula.num_vars:
+            values.set(var, val)
+    try:
+        from vectorized import falsified_clauses as falsified_vectorized
+    except ImportError:
+        return formula.unsatisfied(values.values)
+    return falsified_vectorized(formula, values.values)
+
+
+# True if `assignment` satisfies every clause
+def check_model(clauses, assignment):
+    return not falsified_clauses(clauses, assignment)
+
+
+# Forward DRAT checker for small instances. Every added lemma must be RUP
+# (unit propagation on its negation reaches a conflict) or RAT on its first
+# literal; check() succeeds once the empty clause is derived. Deleting a
+# unit or a clause that is the reason of a level-0 assignment is ignored,
+# as drat-trim does. Clause propagation reuses the solvers' Propagator.
+class ProofChecker:
+    def __init__(self, clauses):
+        self.formula = as_formula(clauses)
+        self.propagator = Propagator(self.formula.num_vars)
+        self.clauses = {}  # Sorted literals -> stored copies of that clause
+        self.inconsistent = False  # Unit propagation alone refutes the clause set
+        self.lemmas = 0
+        self.failed_step = None  # Index of the first lemma that could not be verified
+        for lits in self.formula:
+            self._add(list(lits))
+
+    # Verify a proof (see read_drat for the accepted sources)
+    def check(self, proof):
+        for step, (deleted, lits) in enumerate(read_drat(proof)):
+            lits = list(dict.fromkeys(lits))
+            self._grow(lits)
+            if deleted:
+                self._delete(lits)
+                continue
+            self.lemmas += 1
+            if not self._rup(lits) and not self._rat(lits):
+                self.failed_step = step
+                return False
+            if not lits:
+                return True
+            self._add(lits)
+        return self.inconsistent
+
+    def _grow(self, lits):
+        num_vars = max((lit_var(lit) for lit in lits), default=0)
+        if num_vars > self.propagator.num_vars:
+            self.propagator.grow(num_vars)
+
+    def _add(self, lits):
+        lits = list(dict.fromkeys(lits))
+        if any(neg(lit) in lits for lit in lits):
+            return  # Tautologies never take part in propagation
+        self.clauses.setdefault(tuple(sorted(lits)), []).append(lits)
+        if self.inconsistent:
+            return
+        propagator = self.propagator
+        values = propagator.values
+        # Watch non-false literals; literals false at level 0 stay false
+        lits.sort(key=lambda lit: values[lit] == FALSE)
+        if not lits or values[lits[0]] == FALSE:
+            self.inconsistent = True
+            return
+        if len(lits) > 1:
+            propagator.attach(lits)
+        if len(lits) == 1 or values[lits[1]] == FALSE:
+            propagator.assign(lits[0], lits if len(lits) > 1 else None)
+        if propagator.propagate() is not None:
+            self.inconsistent = True
+
+    def _delete(self, lits):
+        copies = self.clauses.get(tuple(sorted(lits)))
+        if not copies or len(lits) < 2:
+            return
+        clause = copies[-1]
+        propagator = self.propagator
+        if propagator.reason[lit_var(clause[0])] is clause:
+            return
+        copies.pop()
+        if not copies:
+            del self.clauses[tuple(sorted(lits))]
+        for lit in clause[:2]:
+            watches = propagator.watches[lit]
+            watches[:] = [other for other in watches if other is not clause]
+
+    # Reverse unit propagation: assuming every literal false must conflict
+    def _rup(self, lits):
+        if self.inconsistent:
+            return True
+        propagator = self.propagator
+        values = propagator.values
+        propagator.new_decision_level()
+        conflict = False
+        for lit in lits:
+            if values[lit] == TRUE:
+                conflict = True
+                break
+            if values[lit] == UNASSIGNED:
+                propagator.assign(neg(lit))
+        if not conflict:
+            conflict = propagator.propagate() is not None
+        propagator.backtrack(0)
+        return conflict
+
+    # Resolution asymmetric tautology on the first literal: every resolvent
+    # with a clause containing its negation must be RUP
+    def _rat(self, lits):
+        if not lits:
+            return False
+        pivot = lits[0]
+        for copies in list(self.clauses.values()):
+            for clause in copies:
+                if neg(pivot) in clause:
+                    resolvent = lits + [lit for lit in clause if lit != neg(pivot) and lit not in lits]
+                    if any(neg(lit) in resolvent for lit in resolvent):
+                        continue  # Tautological resolvent
+                    if not self._rup(resolvent):
+                        return False
+        return True
+
+
+# Check a DRAT refutation of `clauses`
+def check_proof(clauses, proof):
+    return ProofChecker(clauses).check(proof)
@@ -0,0 +1,152 @@
+from literals import lit_var, lit_val, neg
+
+# Literal values stored in Propagator.values
+UNASSIGNED = 0
+TRUE = 1
+FALSE = 2
+
+
+# Unit propagation engine based on two watched literals.
+# Every clause keeps its two watched literals in positions 0 and 1 and sits in
+# the watch lists of both. Assigning a literal only visits the clauses that
+# watch its negation, so the cost of an assignment does not depend on the total
+# number of clauses.
+class Propagator:
+    def __init__(self, num_vars):
+        self.num_vars = num_vars
+        self.values = bytearray(2 * num_vars + 2)  # Indexed by literal
+        self.level = [0] * (num_vars + 1)  # Indexed by variable
+        self.reason = [None] * (num_vars + 1)  # Clause that implied the variable
+        self.watches = [[] for _ in range(2 * num_vars + 2)]
+        self.clauses = []
+        self.trail = []  # Assigned literals in chronological order
+        self.trail_lim = []  # Trail size at the start of each decision level
+        self.qhead = 0  # Next trail position to propagate
+        self.propagations = 0
+        self.decisions = 0
+        self.conflicts = 0
+        self.heuristic = None  # Decision heuristic told about undone assignments
+
+    # Make room for variables up to num_vars
+    def grow(self, num_vars):
+        extra = num_vars - self.num_vars
+        self.values.extend(bytes(2 * extra))
+        self.level.extend([0] * extra)
+        self.reason.extend([None] * extra)
+        self.watches.extend([] for _ in range(2 * extra))
+        self.num_vars = num_vars
+
+    def decision_level(self):
+        return len(self.trail_lim)
+
+    def value(self, lit):
+        return self.values[lit]
+
+    # Add a clause at decision level 0. Returns False if the formula became
+    # trivially unsatisfiable (empty clause or a unit contradicting the trail).
+    def add_clause(self, lits):
+        values = self.values
+        clause = []
+        for lit in lits:
+            if values[lit] == TRUE or neg(lit) in clause:
+                return True  # Satisfied at level 0 or tautology
+            if values[lit] == UNASSIGNED and lit not in clause:
+                clause.append(lit)
+        if not clause:
+            return False
+        if len(clause) == 1:
+            self.assign(clause[0])
+            return True
+        self.attach(clause)
+        self.clauses.append(clause)
+        return True
+
+    def attach(self, clause):
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    def detach(self, clause):
+        self.watches[clause[0]].remove(clause)
+        self.watches[clause[1]].remove(clause)
+
+    def new_decision_level(self):
+        self.decisions += 1
+        self.trail_lim.append(len(self.trail))
+
+    def assign(self, lit, reason=None):
+        if self.values[lit] != UNASSIGNED:
+            return self.values[lit] == TRUE
+        var = lit_var(lit)
+        self.values[lit] = TRUE
+        self.values[neg(lit)] = FALSE
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+        return True
+
+    # Propagate every pending trail literal. Returns the conflicting clause,
+    # or None if no clause became falsified.
+    def propagate(self):
+        values = self.values
+        watches = self.watches
+        trail = self.trail
+        while self.qhead < len(trail):
+            false_lit = neg(trail[self.qhead])
+            self.qhead += 1
+            self.propagations += 1
+            ws = watches[false_lit]
+            i = j = 0
+            n = len(ws)
+            while i < n:
+                clause = ws[i]
+                i += 1
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                if values[first] == TRUE:
+                    ws[j] = clause
+                    j += 1
+                    continue
+                # Look for a new literal to watch
+                for k in range(2, len(clause)):
+                    if values[clause[k]] != FALSE:
+                        clause[1], clause[k] = clause[k], false_lit
+                        watches[clause[1]].append(clause)
+                        break
+                else:
+                    ws[j] = clause
+                    j += 1
+                    if values[first] == FALSE:
+                        # Conflict: keep the remaining watchers and stop
+                        while i < n:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        self.qhead = len(trail)
+                        self.conflicts += 1
+                        return clause
+                    self.assign(first, clause)
+            del ws[j:]
+        return None
+
+    # Undo every assignment above the given decision level
+    def backtrack(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        values = self.values
+        start = self.trail_lim[level]
+        if self.heuristic is not None:
+            self.heuristic.unassign(self.trail[start:])
+        for lit in self.trail[start:]:
+            var = lit_var(lit)
+            values[lit] = UNASSIGNED
+            values[neg(lit)] = UNASSIGNED
+            self.reason[var] = None
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    # Current assignment as a {var: bool} dict
+    def model(self):
+        return {lit_var(lit): lit_val(lit) for lit in self.trail}
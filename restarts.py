@@ -0,0 +1,61 @@
+# Restart policies for CDCL. Each policy hands out the number of conflicts
+# allowed before the next restart.
+
+
+# Element i (1-based) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...
+def luby(i):
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while (1 << k) - 1 != i:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+class LubyRestarts:
+    def __init__(self, unit=100):
+        self.unit = unit
+        self.restarts = 0
+
+    def next_limit(self):
+        self.restarts += 1
+        return self.unit * luby(self.restarts)
+
+
+class GeometricRestarts:
+    def __init__(self, first=100, factor=1.5):
+        self.limit = first
+        self.factor = factor
+        self.restarts = 0
+
+    def next_limit(self):
+        self.restarts += 1
+        limit = int(self.limit)
+        self.limit *= self.factor
+        return limit
+
+
+# Never restart
+class NoRestarts:
+    restarts = 0
+
+    def next_limit(self):
+        return float("inf")
+
+
+RESTART_POLICIES = {
+    "luby": LubyRestarts,
+    "geometric": GeometricRestarts,
+    "none": NoRestarts,
+}
+
+
+def make_restart_policy(restart):
+    if isinstance(restart, str):
+        if restart not in RESTART_POLICIES:
+            raise ValueError(f"Unknown restart policy: {restart}")
+        return RESTART_POLICIES[restart]()
+    return restart
@@ -1,138 +1,569 @@
+import threading
 import time
 import random
 
+from clause_db import ClauseDatabase, LearntClause
+from heuristics import make_heuristic
+from formula import Assignment, PackedFormula, as_formula
+from literals import lit_val, lit_var, neg, to_lit
+from local_search import LocalSearch, STRATEGIES
+from maxsat import OLL, SATLike, WCNF
+from preprocess import Preprocessor
+from proof import check_model
+from propagation import FALSE, TRUE, Propagator
+from restarts import make_restart_policy
+from limits import UNKNOWN, Limits
+from stats import SolverStats
+
 
 # Base class for SAT algorithms
 class SATAlgorithm:
+    complete = False  # True if an "Unsatisfiable" answer is a proof
+    monitor = None  # Optional stats.Monitor for progress callbacks and timing
+    limits = None  # Optional limits.Limits; solve() returns UNKNOWN when one is hit
+    proof = None  # Optional proof.DratWriter receiving the clauses DPLL/CDCL derive
+    check_every = 64  # Search steps between two limit checks
+
     def __init__(self, clauses):
         self.clauses = clauses
+        self.formula = as_formula(clauses)  # Packed integer-literal form used by the solvers
+        self.owns_formula = self.formula is not clauses  # A caller's PackedFormula is copied before changes
         self.assignment = {}
+        self.core = []
+        self.propagator = None
+        self.interrupt_event = threading.Event()
+        self.stop_reason = None  # Which limit stopped the last solve(), if any
 
     def solve(self):
         raise NotImplementedError("This method should be overridden by subclasses.")
 
-
-# Implementation of the DPLL algorithm
-class DPLL(SATAlgorithm):
-    def solve(self):
-        result, assignment = self._dpll(self.clauses, {})
-        self.assignment = assignment  # Update self.assignment with final result
-        return result, assignment
-
-    def _dpll(self, clauses, assignment):
-        if all(self._is_clause_satisfied(clause, assignment) for clause in clauses):
-            return True, assignment
-        if any(self._is_clause_unsatisfied(clause, assignment) for clause in clauses):
-            return False, assignment
-
-        var = self._select_unassigned_variable(clauses, assignment)
-        for value in [True, False]:
-            new_assignment = assignment.copy()
-            new_assignment[var] = value
-            result, final_assignment = self._dpll(clauses, new_assignment)
-            if result:
-                return True, final_assignment  # Return satisfying assignment
-        return False, assignment
-
-    def _is_clause_satisfied(self, clause, assignment):
-        return any(assignment.get(var) == val for var, val in clause)
-
-    def _is_clause_unsatisfied(self, clause, assignment):
-        return all(assignment.get(var) is not None and assignment[var] != val for var, val in clause)
-
-    def _select_unassigned_variable(self, clauses, assignment):
-        for clause in clauses:
-            for var, _ in clause:
-                if var not in assignment:
-                    return var
+    # Work counters (decisions, propagations, conflicts, restarts, flips,
+    # learned and deleted clauses) accumulated so far
+    def stats(self):
+        return SolverStats.collect(self)
+
+    # Ask a running solve() to stop and return UNKNOWN. Safe to call from
+    # another thread; the solver notices it within check_every steps. Every
+    # solve() starts by clearing the request, so an interrupt that arrives
+    # after a solve has finished does not cancel the next one.
+    def interrupt(self):
+        self.interrupt_event.set()
+
+    def _begin_solve(self):
+        self.interrupt_event.clear()
+        self.stop_reason = None
+        self.countdown = self.check_every
+        if self.limits is not None:
+            self.limits.start(self)
+        if self.monitor is not None:
+            self.monitor.start(self)
+
+    def _end_solve(self):
+        if self.monitor is not None:
+            self.monitor.finish(self)
+        if self.proof is not None:
+            self.proof.flush()
+
+    # The clauses alone are unsatisfiable: the proof ends with the empty clause
+    def _refute(self):
+        self.ok = False
+        if self.proof is not None:
+            self.proof.add([])
+
+    # Cheap per-step check: only every check_every calls looks at the limits
+    def _budget_exhausted(self):
+        self.countdown -= 1
+        if self.countdown:
+            return False
+        self.countdown = self.check_every
+        return self._limit_reached()
+
+    def _limit_reached(self):
+        if self.interrupt_event.is_set():
+            self.interrupt_event.clear()
+            self.stop_reason = "interrupted"
+        elif self.limits is not None:
+            self.stop_reason = self.limits.exceeded(self)
+        return self.stop_reason is not None
+
+    # Add a clause of (var, bool) literals. Solvers that keep state between
+    # solve() calls pick it up on the next call.
+    def add_clause(self, clause):
+        if not self.owns_formula:
+            self.formula = self.formula.copy()
+            self.owns_formula = True
+        self.formula.add_clause([to_lit(var, val) for var, val in clause])
+
+    # Prepare the propagator for a solve() call. The first call builds it from
+    # the formula; later calls backtrack to level 0 and only add the clauses
+    # added since, keeping learned clauses and heuristic scores.
+    def _load(self, assumptions):
+        self.assumptions = [to_lit(var, val) for var, val in assumptions or ()]
+        self.core = []
+        formula = self.formula
+        num_vars = max([formula.num_vars] + [lit_var(lit) for lit in self.assumptions])
+        first = self.propagator is None
+        if first:
+            self.propagator = Propagator(num_vars)
+            self._init_heuristic(num_vars)
+            self.loaded = 0
+            self.ok = True  # False once the clauses alone are unsatisfiable
+        else:
+            self.propagator.backtrack(0)
+            if num_vars > self.propagator.num_vars:
+                self.propagator.grow(num_vars)
+                self.order.grow(num_vars)
+        for i in range(self.loaded, len(formula)):
+            lits = formula.clause(i)
+            if not first:  # _init_heuristic only saw the variables of the first load
+                for lit in lits:
+                    self.order.add_variable(lit_var(lit))
+            if not self.propagator.add_clause(lits):
+                self._refute()
+        self.loaded = len(formula)
+        for lit in self.assumptions:
+            self.order.add_variable(lit_var(lit))
+
+    # On UNKNOWN the assignment is the partial one reached when the search stopped
+    def _result(self, satisfiable):
+        self._end_solve()
+        if satisfiable or satisfiable is UNKNOWN:
+            self.assignment = self.propagator.model()  # Update self.assignment with final result
+        else:
+            self.assignment = {}
+        return satisfiable, self.assignment
+
+    # Set up the decision heuristic over the variables occurring in the formula
+    def _init_heuristic(self, num_vars):
+        variables = self.formula.variables()
+        self.order = make_heuristic(self.heuristic, num_vars, variables)
+        self.propagator.heuristic = self.order
+
+    def _select_unassigned_literal(self):
+        return self.order.pick(self.propagator.values)
+
+    # Next assumption to decide, None once all of them hold. Assumptions
+    # that already hold get an empty decision level so that level i + 1
+    # always belongs to assumption i. Sets self.core and returns False if an
+    # assumption is already false.
+    def _next_assumption(self):
+        propagator = self.propagator
+        while propagator.decision_level() < len(self.assumptions):
+            assumption = self.assumptions[propagator.decision_level()]
+            if propagator.value(assumption) == TRUE:
+                propagator.new_decision_level()
+            elif propagator.value(assumption) == FALSE:
+                self.core = self._analyze_final(assumption)
+                return False
+            else:
+                return assumption
         return None
 
+    # Collect the assumptions that imply the negation of a failed assumption
+    def _analyze_final(self, failed):
+        propagator = self.propagator
+        core = [failed]
+        seen = {lit_var(failed)}
+        if propagator.decision_level() == 0:
+            return [(lit_var(lit), lit_val(lit)) for lit in core]
+        for lit in reversed(propagator.trail[propagator.trail_lim[0]:]):
+            var = lit_var(lit)
+            if var not in seen:
+                continue
+            reason = propagator.reason[var]
+            if reason is None:
+                core.append(lit)  # An assumption decision
+            else:
+                for q in reason:
+                    if propagator.level[lit_var(q)] > 0:
+                        seen.add(lit_var(q))
+        return [(lit_var(lit), lit_val(lit)) for lit in dict.fromkeys(core)]
 
-# Simplified implementation of the CDCL algorithm
-class CDCL(SATAlgorithm):
-    def solve(self):
-        result, assignment = self._cdcl(self.clauses, {})
-        self.assignment = assignment  # Update self.assignment with final result
-        return result, assignment
 
-    def _cdcl(self, clauses, assignment):
+# Implementation of the DPLL algorithm. Incremental: clauses added with
+# add_clause() and heuristic scores carry over between solve() calls.
+class DPLL(SATAlgorithm):
+    complete = True
+
+    def __init__(self, clauses, heuristic="evsids"):
+        super().__init__(clauses)
+        self.heuristic = heuristic
+
+    # Solve under optional assumptions, a list of (var, bool) literals that
+    # must hold. If they make the formula unsatisfiable, self.core holds a
+    # subset of them that cannot all be true together (DPLL learns nothing,
+    # so when the search itself fails the core is every assumption).
+    def solve(self, assumptions=None):
+        self._load(assumptions)
+        self._begin_solve()
+        return self._result(self.ok and self._dpll())
+
+    # Iterative search: one entry per decision level records the decision
+    # literal and whether its other polarity is already being explored.
+    # Backtracking undoes the trail instead of copying assignments.
+    # With a proof attached, every failed branch adds the negation of its
+    # decisions, which unit propagation on the earlier clauses justifies.
+    def _dpll(self):
+        propagator = self.propagator
+        monitor = self.monitor
+        proof = self.proof
+        decisions = []
         while True:
-            unsatisfied_clauses = [clause for clause in clauses if not self._is_clause_satisfied(clause, assignment)]
-            if not unsatisfied_clauses:
-                return True, assignment  # All clauses satisfied
-            conflict_clause = unsatisfied_clauses[0]
-            for var, val in conflict_clause:
-                if var not in assignment:
-                    assignment[var] = not val  # Flip assignment on first conflict
-                    break
+            if monitor is not None:
+                monitor.poll(self)
+            if self._budget_exhausted():
+                return UNKNOWN
+            conflict = propagator.propagate()
+            if conflict is not None:
+                # Conflict: some clause has all its literals false
+                for lit in conflict:
+                    self.order.bump(lit_var(lit))
+                self.order.on_conflict()
+                if propagator.decision_level() == 0:
+                    self._refute()
+                    return False
+                if proof is not None:
+                    proof.add([neg(lit) for lit, _ in decisions if lit is not None])
+                while decisions and decisions[-1][1]:
+                    decisions.pop()  # Both branches of this decision failed (or it is an assumption)
+                    if proof is not None and decisions:
+                        proof.add([neg(lit) for lit, _ in decisions if lit is not None])
+                if not decisions:
+                    if self.assumptions:
+                        self.core = [(lit_var(lit), lit_val(lit)) for lit in self.assumptions]
+                    else:
+                        self._refute()
+                    return False
+                lit, _ = decisions.pop()
+                propagator.backtrack(len(decisions))  # Undo the assignments of the failed branch
+                decisions.append((neg(lit), True))
+                propagator.new_decision_level()
+                propagator.assign(neg(lit))
+                continue
+
+            lit = self._next_assumption()
+            if lit is False:
+                return False
+            while len(decisions) < propagator.decision_level():
+                decisions.append((None, True))  # Empty levels of assumptions that already held
+            if lit is not None:
+                decisions.append((lit, True))  # Assumptions are never flipped
             else:
-                return False, assignment  # Return unsatisfiable if stuck in a conflict cycle
-
-    def _is_clause_satisfied(self, clause, assignment):
-        return any(assignment.get(var) == val for var, val in clause)
-
-
-# Implementation of the Max-SAT algorithm
+                lit = self._select_unassigned_literal()
+                if lit is None:
+                    return True  # Every variable assigned without conflict
+                decisions.append((lit, False))
+            propagator.new_decision_level()
+            propagator.assign(lit)
+
+
+# Implementation of the CDCL algorithm: 1-UIP conflict analysis,
+# non-chronological backjumping, clause learning and restarts. Incremental:
+# learned clauses, heuristic scores and clauses added with add_clause()
+# carry over between solve() calls.
+class CDCL(SATAlgorithm):
+    complete = True
+
+    def __init__(self, clauses, restart="luby", heuristic="evsids"):
+        super().__init__(clauses)
+        self.restart = restart
+        self.heuristic = heuristic
+        self.clause_db = None
+        self.conflicts = 0
+        self.restarts = 0
+
+    # Solve under optional assumptions, a list of (var, bool) literals that
+    # must hold. If the answer is "Unsatisfiable" because of the assumptions,
+    # self.core holds a subset of them that cannot all be true together.
+    def solve(self, assumptions=None):
+        if self.propagator is None:
+            self._load(assumptions)
+            self.restart_policy = make_restart_policy(self.restart)
+            self.clause_db = ClauseDatabase(self.propagator)
+        else:
+            self._load(assumptions)
+        self.clause_db.proof = self.proof
+        self._begin_solve()
+        return self._result(self.ok and self._cdcl())
+
+    def _cdcl(self):
+        propagator = self.propagator
+        monitor = self.monitor
+        proof = self.proof
+        restart_limit = self.restart_policy.next_limit()
+        conflicts_since_restart = 0
+        while True:
+            if monitor is not None:
+                monitor.poll(self)
+            if self._budget_exhausted():
+                return UNKNOWN
+            conflict = propagator.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts_since_restart += 1
+                if propagator.decision_level() == 0:
+                    self._refute()
+                    return False  # Conflict without any decision: unsatisfiable
+                learnt, backjump_level = self._analyze(conflict)
+                if proof is not None:
+                    proof.add(learnt)
+                self.order.on_conflict()
+                self.clause_db.on_conflict()
+                propagator.backtrack(backjump_level)
+                if len(learnt) == 1:
+                    propagator.assign(learnt[0])
+                else:
+                    propagator.assign(learnt[0], self.clause_db.add(learnt))
+                if self.clause_db.should_reduce(self.conflicts):
+                    self.clause_db.reduce()
+                continue
+
+            if conflicts_since_restart >= restart_limit:
+                if not self._restart():
+                    self._refute()
+                    return False
+                restart_limit = self.restart_policy.next_limit()
+                conflicts_since_restart = 0
+
+            # Assumptions are decided first, one per decision level
+            lit = self._next_assumption()
+            if lit is False:
+                return False
+            if lit is None:
+                lit = self._select_unassigned_literal()
+            if lit is None:
+                return True  # All clauses satisfied
+            propagator.new_decision_level()
+            propagator.assign(lit)
+
+    # Go back to decision level 0. Subclasses may add clauses here; returns
+    # False if that made the formula unsatisfiable.
+    def _restart(self):
+        self.propagator.backtrack(0)
+        self.restarts += 1
+        return True
+
+    # Walk the implication graph back from the conflict until a single literal
+    # of the current decision level remains (the first unique implication point)
+    def _analyze(self, conflict):
+        propagator = self.propagator
+        level = propagator.level
+        trail = propagator.trail
+        current_level = propagator.decision_level()
+        seen = set()
+        learnt = [None]
+        pending = 0  # Current-level literals still to be resolved away
+        index = len(trail) - 1
+        clause = conflict
+        lit = None
+        while True:
+            if isinstance(clause, LearntClause):
+                self.clause_db.bump(clause)
+            for q in clause:
+                var = lit_var(q)
+                if var in seen or (lit is not None and q == lit) or level[var] == 0:
+                    continue
+                seen.add(var)
+                self.order.bump(var)
+                if level[var] == current_level:
+                    pending += 1
+                else:
+                    learnt.append(q)
+            while lit_var(trail[index]) not in seen:
+                index -= 1
+            lit = trail[index]
+            index -= 1
+            seen.discard(lit_var(lit))
+            pending -= 1
+            if pending == 0:
+                break
+            clause = propagator.reason[lit_var(lit)]
+        learnt[0] = neg(lit)
+
+        if len(learnt) == 1:
+            return learnt, 0
+        # Watch the literal from the highest remaining level second, so the
+        # clause becomes unit right after backjumping to that level
+        highest = max(range(1, len(learnt)), key=lambda i: level[lit_var(learnt[i])])
+        learnt[1], learnt[highest] = learnt[highest], learnt[1]
+        return learnt, level[lit_var(learnt[1])]
+
+
+# Implementation of the Max-SAT algorithm. Takes plain clauses (all soft,
+# weight 1) or a maxsat.WCNF with hard and weighted soft clauses.
+#   "sample": keep the random assignment satisfying the most clauses. With NumPy installed
+#             the samples are scored in vectorized batches.
+#   "local":  SATLike clause-weighting local search (anytime).
+#   "core":   core-guided OLL on top of CDCL (exact).
+# on_improve(cost, assignment) is called whenever "local" or "core" finds a
+# cheaper assignment. When a limit stops the search, solve() returns UNKNOWN
+# with the best assignment found so far.
 class MaxSAT(SATAlgorithm):
-    def solve(self):
-        satisfied_clauses, best_assignment = 0, {}
-        for _ in range(50):  # Increased to 50 iterations
-            temp_assignment = {var: random.choice([True, False]) for var, _ in self.clauses[0]}
-            count = sum(self._is_clause_satisfied(clause, temp_assignment) for clause in self.clauses)
+    def __init__(self, clauses, samples=None, seed=None, mode="sample", on_improve=None):
+        if isinstance(clauses, WCNF):
+            self.wcnf = clauses
+            formula = PackedFormula.from_literals(list(clauses.hard) + list(clauses.soft), clauses.num_vars)
+        else:
+            formula = as_formula(clauses)
+            self.wcnf = WCNF.from_formula(formula)
+        super().__init__(formula)
+        if mode not in ("sample", "local", "core"):
+            raise ValueError(f"Unknown Max-SAT mode: {mode}")
+        self.owns_wcnf = False  # The WCNF may be the caller's or share the caller's formula
+        self.samples = samples
+        self.seed = seed
+        self.mode = mode
+        self.on_improve = on_improve
+        self.cost = None
+
+    # Clauses added between solves are soft with weight 1, like every clause
+    # of a plain formula
+    def add_clause(self, clause):
+        if not self.owns_wcnf:
+            self.wcnf = WCNF(self.wcnf.hard.copy(), self.wcnf.soft.copy(), self.wcnf.weights)
+            self.owns_wcnf = True
+        self.wcnf.add_soft([to_lit(var, val) for var, val in clause], 1)
+        super().add_clause(clause)
+
+    def solve(self, max_flips=100000, time_limit=None):
+        if self.mode == "local":
+            # Created before the limits start, so the flip budget counts this search only
+            self.search = SATLike(self.wcnf, self.seed, self.on_improve)
+        self._begin_solve()
+        if self.mode == "local":
+            self.cost, best_assignment = self.search.solve(max_flips, time_limit, stop=self._limit_reached)
+        elif self.mode == "core":
+            oll = OLL(self.wcnf, CDCL, self.on_improve, self.limits, self.interrupt_event)
+            self.cost, best_assignment = oll.solve()
+            self.stop_reason = oll.stop_reason
+        else:
+            try:
+                from vectorized import BatchEvaluator
+            except ImportError:
+                satisfied_clauses, best_assignment = self._sample(self.samples or 50)
+            else:
+                satisfied_clauses, best_assignment = self._sample_batched(BatchEvaluator, self.samples or 5000)
+            self.cost = self.wcnf.cost(best_assignment)
+        self._end_solve()
+        self.assignment = best_assignment or {}
+        if self.stop_reason is not None and self.cost != 0:
+            return UNKNOWN, self.assignment
+        return self.cost == 0, self.assignment
+
+    def _sample(self, samples):
+        formula = self.formula
+        variables = formula.variables()
+        rng = random.Random(self.seed)
+        satisfied_clauses, best_assignment = -1, {}
+        for _ in range(samples):
+            if self._limit_reached():
+                break
+            temp_assignment = Assignment(formula.num_vars)
+            for var in variables:
+                temp_assignment.set(var, rng.random() < 0.5)
+            count = formula.count_satisfied(temp_assignment.values)
             if count > satisfied_clauses:
-                satisfied_clauses, best_assignment = count, temp_assignment
-        self.assignment = best_assignment
-        return satisfied_clauses == len(self.clauses), best_assignment
-
-    def _is_clause_satisfied(self, clause, assignment):
-        return any(assignment.get(var) == val for var, val in clause)
+                satisfied_clauses, best_assignment = count, temp_assignment.to_dict(variables)
+        return satisfied_clauses, best_assignment
+
+    def _sample_batched(self, evaluator_class, samples, batch_size=1000):
+        import numpy as np
+        evaluator = evaluator_class(self.formula)
+        rng = np.random.default_rng(self.seed)
+        satisfied_clauses, best = -1, None
+        for start in range(0, samples, batch_size):
+            if best is not None and self._limit_reached():
+                break
+            candidates = evaluator.random_candidates(min(batch_size, samples - start), rng)
+            counts = evaluator.count_satisfied(candidates)
+            index = int(counts.argmax())
+            if counts[index] > satisfied_clauses:
+                satisfied_clauses, best = int(counts[index]), candidates[index]
+            if satisfied_clauses == evaluator.num_clauses:
+                break
+        best_assignment = {var: bool(best[var]) for var in self.formula.variables()}
+        return satisfied_clauses, best_assignment
 
 
-# Implementation of the GSAT algorithm
+# Implementation of the GSAT algorithm and its WalkSAT/probSAT variants
+# on top of the incremental local-search engine. Local search cannot prove
+# unsatisfiability: without a model solve() returns UNKNOWN together with
+# the assignment that left the fewest clauses unsatisfied.
 class GSAT(SATAlgorithm):
-    def solve(self, max_flips=500):
-        # Initialize assignment for each variable in the first clause
-        assignment = {var: random.choice([True, False]) for var, _ in self.clauses[0]}
+    def __init__(self, clauses, strategy="gsat", noise=None, seed=None):
+        super().__init__(clauses)
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown local search strategy: {strategy}")
+        self.strategy = strategy
+        self.noise = noise
+        self.seed = seed
 
+    def solve(self, max_flips=500):
+        pick, noise = STRATEGIES[self.strategy]
+        if self.noise is not None:
+            noise = self.noise
+        search = self.search = LocalSearch(self.formula, self.seed, track_improving=self.strategy == "gsat")
+        search.reset()
+        monitor = self.monitor
+        self._begin_solve()
+        if search.has_empty_clause:
+            self._end_solve()
+            self.assignment = search.assignment()
+            return False, self.assignment
+        best_unsat, best_values = len(search.unsat), bytearray(search.values)
         for _ in range(max_flips):
-            if all(self._is_clause_satisfied(clause, assignment) for clause in self.clauses):
-                self.assignment = assignment
-                return True, assignment
-
-            clause = self._select_unsatisfied_clause(assignment)
-            if clause is None:
+            if not search.unsat:
                 break
-
-            var = random.choice(clause)
-            if var[0] not in assignment:
-                assignment[var[0]] = random.choice([True, False])  # Initialize if not present
-
-            assignment[var[0]] = not assignment[var[0]]  # Flip the variable's value
-        self.assignment = assignment
-        return False, assignment
-
-    def _is_clause_satisfied(self, clause, assignment):
-        return any(assignment.get(var) == val for var, val in clause)
-
-    def _select_unsatisfied_clause(self, assignment):
-        unsatisfied = [clause for clause in self.clauses if not self._is_clause_satisfied(clause, assignment)]
-        return random.choice(unsatisfied) if unsatisfied else None
+            if monitor is not None:
+                monitor.poll(self)
+            if self._budget_exhausted():
+                break
+            search.flip(pick(search, noise))  # Flip the chosen variable's value
+            if len(search.unsat) < best_unsat:
+                best_unsat, best_values = len(search.unsat), bytearray(search.values)
+        self._end_solve()
+        if not search.unsat:
+            self.assignment = search.assignment()
+            return True, self.assignment
+        self.assignment = search.assignment(best_values)
+        return UNKNOWN, self.assignment
 
 
 # Class for comparing SAT algorithms
+# The formula is simplified once by the Preprocessor before any solver runs.
+# Max-SAT counts satisfied clauses, which simplification does not preserve,
+# so it always gets the original formula.
 class SATComparison:
-    def __init__(self, clauses):
+    def __init__(self, clauses, preprocess=True):
         self.clauses = clauses
+        original = as_formula(clauses)  # Pack once and share between the solvers
+        self.preprocessor = None
+        self.formula = original
+        if preprocess:
+            start_time = time.perf_counter()
+            self.preprocessor = Preprocessor(original)
+            self.formula = self.preprocessor.run()
+            self.preprocess_time = time.perf_counter() - start_time
         self.algorithms = {
-            "DPLL": DPLL(clauses),
-            "CDCL": CDCL(clauses),
-            "Max-SAT": MaxSAT(clauses),
-            "GSAT": GSAT(clauses)
+            "DPLL": DPLL(self.formula),
+            "CDCL": CDCL(self.formula),
+            "Max-SAT": MaxSAT(original),
+            "GSAT": GSAT(self.formula)
         }
 
-    def run_and_compare(self, max_flips=500):
+    # Map a model of the simplified formula back to the original variables
+    def _reconstruct(self, result, assignment):
+        if self.preprocessor is None or not result:
+            return assignment
+        return self.preprocessor.reconstruct(assignment)
+
+    # `limits` (a limits.Limits) applies to each solver separately. With
+    # verify=True every "Satisfiable" answer is checked against the original
+    # clauses and the outcome stored under "Verified".
+    def run_and_compare(self, max_flips=500, limits=None, verify=False):
         results = {}
         for name, algo in self.algorithms.items():
+            algo.limits = limits
             start_time = time.time()
             if name == "GSAT":
                 result, assignment = algo.solve(max_flips=max_flips)
@@ -142,14 +573,92 @@ class SATComparison:
             results[name] = {
                 "Result": result,
                 "Time": end_time - start_time,
-                "Assignment": assignment
+                "Assignment": assignment if name == "Max-SAT" else self._reconstruct(result, assignment)
             }
+            if verify and result:
+                results[name]["Verified"] = check_model(self.clauses, results[name]["Assignment"])
         return results
 
-
-# Parameters for generating a massive dataset
-num_clauses = 1000  # Number of clauses
-num_variables = 10  # Number of distinct variables
+    # Portfolio mode: run every solver plus differently seeded WalkSAT/probSAT
+    # copies in parallel processes and return the first definitive answer
+    # (any satisfying assignment, or "Unsatisfiable" from a complete solver).
+    # Each worker stops itself after `timeout` seconds and any still running
+    # then are terminated. Returns None if no solver gave a definitive answer.
+    def run_portfolio(self, timeout=None, local_search_copies=4, max_flips=100000, max_workers=None):
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        formula = self.formula
+        entries = [
+            ("DPLL", DPLL, {}, {}),
+            ("CDCL", CDCL, {}, {}),
+            ("Max-SAT", MaxSAT, {}, {}),
+            ("GSAT", GSAT, {}, {"max_flips": max_flips}),
+        ]
+        for seed in range(local_search_copies):
+            strategy = ("walksat", "probsat")[seed % 2]
+            entries.append((f"{strategy}-{seed}", GSAT, {"strategy": strategy, "seed": seed}, {"max_flips": max_flips}))
+
+        executor = ProcessPoolExecutor(max_workers=max_workers or len(entries),
+                                       initializer=_init_portfolio_worker, initargs=(formula,))
+        start_time = time.perf_counter()
+        deadline = start_time + timeout if timeout is not None else None
+        limits = Limits(time_limit=timeout) if timeout is not None else None
+        futures = {executor.submit(_run_portfolio_entry, cls, kwargs, solve_kwargs, limits): (name, cls)
+                   for name, cls, kwargs, solve_kwargs in entries}
+        winner = None
+        try:
+            pending = set(futures)
+            while pending and winner is None:
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, cls = futures[future]
+                    if future.exception() is not None:
+                        continue
+                    result, solve_time, assignment = future.result()
+                    if result is True or (result is False and cls.complete):
+                        winner = {
+                            "Algorithm": name,
+                            "Result": result,
+                            "Time": time.perf_counter() - start_time,
+                            "Solve Time": solve_time,
+                            "Assignment": self._reconstruct(result, assignment)
+                        }
+                        break
+        finally:
+            _shutdown_now(executor)
+        return winner
+
+
+# Formula shared by all solvers of one portfolio worker process
+_portfolio_formula = None
+
+
+def _init_portfolio_worker(formula):
+    global _portfolio_formula
+    _portfolio_formula = formula
+
+
+def _run_portfolio_entry(cls, kwargs, solve_kwargs, limits=None):
+    start_time = time.perf_counter()
+    algo = cls(_portfolio_formula, **kwargs)
+    algo.limits = limits
+    result, assignment = algo.solve(**solve_kwargs)
+    return result, time.perf_counter() - start_time, assignment
+
+
+# Cancel queued solvers and stop the ones still running. The executor has no
+# public way to interrupt a running task, so its worker processes are
+# terminated directly.
+def _shutdown_now(executor):
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join()
 
 
 # Function to generate random clauses
@@ -162,17 +671,23 @@ def generate_clauses(num_clauses, num_variables):
     return clauses
 
 
-# Generate the dataset
-clauses = generate_clauses(num_clauses, num_variables)
+# Demo comparison on a random dataset; the command-line solver is main.py
+if __name__ == "__main__":
+    # Parameters for generating a massive dataset
+    num_clauses = 1000  # Number of clauses
+    num_variables = 10  # Number of distinct variables
+
+    # Generate the dataset
+    clauses = generate_clauses(num_clauses, num_variables)
 
-# Run comparison
-comparison = SATComparison(clauses)
-results = comparison.run_and_compare()
+    # Run comparison
+    comparison = SATComparison(clauses)
+    results = comparison.run_and_compare()
 
-# Print results
-for name, data in results.items():
-    print(f"Algorithm: {name}")
-    print(f"Result: {'Satisfiable' if data['Result'] else 'Unsatisfiable'}")
-    print(f"Time: {data['Time']:.4f} seconds")
-    print(f"Assignment: {data['Assignment']}")
-    print("----------")
\ No newline at end of file
+    # Print results
+    for name, data in results.items():
+        print(f"Algorithm: {name}")
+        print(f"Result: {'Unknown' if data['Result'] is None else 'Satisfiable' if data['Result'] else 'Unsatisfiable'}")
+        print(f"Time: {data['Time']:.4f} seconds")
+        print(f"Assignment: {data['Assignment']}")
+        print("----------")
@@ -0,0 +1,121 @@
+import time
+
+COUNTERS = ("decisions", "propagations", "conflicts", "restarts", "flips", "learned", "deleted")
+
+
+# Snapshot of a solver's work counters. The solvers keep these as plain
+# integers on their components (propagator, clause database, local search),
+# so collecting them costs nothing while the search runs.
+class SolverStats:
+    __slots__ = COUNTERS + ("elapsed", "rates", "timings")
+
+    def __init__(self, **counters):
+        for name in COUNTERS:
+            setattr(self, name, counters.get(name, 0))
+        self.elapsed = 0.0
+        self.rates = {}  # Counter -> increase per second since the previous report
+        self.timings = {}  # Hook name -> (calls, seconds) when timing is enabled
+
+    @classmethod
+    def collect(cls, algo):
+        stats = cls()
+        propagator = getattr(algo, "propagator", None)
+        if propagator is not None:
+            stats.decisions = propagator.decisions
+            stats.propagations = propagator.propagations
+            stats.conflicts = propagator.conflicts
+        stats.restarts = getattr(algo, "restarts", 0)
+        clause_db = getattr(algo, "clause_db", None)
+        if clause_db is not None:
+            stats.learned = clause_db.learned
+            stats.deleted = clause_db.deleted
+        search = getattr(algo, "search", None)
+        if search is not None:
+            stats.flips = search.flips
+        return stats
+
+    def __repr__(self):
+        counters = ", ".join(f"{name}={getattr(self, name)}" for name in COUNTERS)
+        return f"SolverStats({counters}, elapsed={self.elapsed:.3f})"
+
+    def as_dict(self):
+        result = {name: getattr(self, name) for name in COUNTERS}
+        result["elapsed"] = self.elapsed
+        if self.rates:
+            result["rates"] = dict(self.rates)
+        if self.timings:
+            result["timings"] = dict(self.timings)
+        return result
+
+
+# Progress reporting and optional hot-path timing for one solver. Attach with
+# `algo.monitor = Monitor(callback)`. The solvers call poll() once per search
+# step; it only reads the clock every `check_every` calls and invokes
+# callback(stats) once `interval` seconds have passed since the last report.
+# With timing=True, propagate/analyze/reduce/flip are wrapped on the solver's
+# instances to accumulate call counts and time; nothing is wrapped otherwise.
+class Monitor:
+    HOOKS = (("propagator", "propagate"), (None, "_analyze"), ("clause_db", "reduce"), ("search", "flip"))
+
+    def __init__(self, callback=None, interval=1.0, timing=False, check_every=128):
+        self.callback = callback
+        self.interval = interval
+        self.timing = timing
+        self.check_every = check_every
+        self.timings = {}
+        self.reports = 0
+
+    def start(self, algo):
+        self.start_time = self.last_time = time.perf_counter()
+        self.last = SolverStats()
+        self.countdown = self.check_every
+        if self.timing:
+            self.instrument(algo)
+
+    def poll(self, algo):
+        self.countdown -= 1
+        if self.countdown:
+            return
+        self.countdown = self.check_every
+        now = time.perf_counter()
+        if now - self.last_time >= self.interval:
+            self.report(algo, now)
+
+    def finish(self, algo):
+        return self.report(algo, time.perf_counter())
+
+    def report(self, algo, now):
+        stats = SolverStats.collect(algo)
+        stats.elapsed = now - self.start_time
+        span = now - self.last_time
+        if span > 0:
+            stats.rates = {name: (getattr(stats, name) - getattr(self.last, name)) / span for name in COUNTERS}
+        stats.timings = {name: tuple(entry) for name, entry in self.timings.items()}
+        self.last, self.last_time = stats, now
+        self.reports += 1
+        if self.callback is not None:
+            self.callback(stats)
+        return stats
+
+    # Wrap the hot-path methods of the solver's current components with timers.
+    # Components created later (a new search on the next solve) are wrapped
+    # at that solve's start().
+    def instrument(self, algo):
+        for owner_name, method in self.HOOKS:
+            owner = algo if owner_name is None else getattr(algo, owner_name, None)
+            if owner is None or not hasattr(owner, method) or method in vars(owner):
+                continue
+            setattr(owner, method, self._timed(method.lstrip("_"), getattr(owner, method)))
+
+    def _timed(self, name, function):
+        entry = self.timings.setdefault(name, [0, 0.0])
+        clock = time.perf_counter
+
+        def timed(*args):
+            start = clock()
+            try:
+                return function(*args)
+            finally:
+                entry[0] += 1
+                entry[1] += clock() - start
+        return timed
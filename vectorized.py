@@ -0,0 +1,61 @@
+import numpy as np
+
+from propagation import TRUE
+
+
+# Scores many candidate assignments at once. The formula is stored as a
+# padded (clauses x max clause length) matrix of literal indices; padding
+# points at an extra column that is always False. Candidates are a
+# (candidates x num_vars + 1) boolean array, column 0 unused.
+class BatchEvaluator:
+    def __init__(self, formula, max_cells=1 << 24):
+        self.num_vars = formula.num_vars
+        self.num_clauses = len(formula)
+        lits, offsets = formula.as_numpy()
+        lengths = np.diff(offsets)
+        width = int(lengths.max()) if len(lengths) else 0
+        pad = 2 * self.num_vars + 2  # Index of the always-False column
+        matrix = np.full((self.num_clauses, max(width, 1)), pad, dtype=np.int64)
+        rows = np.repeat(np.arange(self.num_clauses), lengths)
+        cols = np.arange(len(lits)) - np.repeat(offsets[:-1], lengths)
+        matrix[rows, cols] = lits
+        self.matrix = matrix
+        # Candidates per chunk, so the (candidates x clauses x width) array stays bounded
+        self.chunk = max(1, max_cells // max(matrix.size, 1))
+
+    # Literal values: column 2*v is variable v, column 2*v+1 its negation
+    def literal_values(self, candidates):
+        values = np.zeros((len(candidates), 2 * self.num_vars + 3), dtype=bool)
+        values[:, 0:2 * self.num_vars + 2:2] = candidates
+        values[:, 1:2 * self.num_vars + 2:2] = ~candidates
+        return values
+
+    # Boolean (candidates x clauses) matrix of satisfied clauses
+    def satisfied(self, candidates):
+        return self.literal_values(candidates)[:, self.matrix].any(axis=2)
+
+    # Number of satisfied clauses for every candidate
+    def count_satisfied(self, candidates):
+        candidates = np.asarray(candidates, dtype=bool)
+        counts = np.empty(len(candidates), dtype=np.int64)
+        for start in range(0, len(candidates), self.chunk):
+            counts[start:start + self.chunk] = self.satisfied(candidates[start:start + self.chunk]).sum(axis=1)
+        return counts
+
+    def random_candidates(self, count, rng):
+        return rng.random((count, self.num_vars + 1)) < 0.5
+
+
+# Indices of the clauses not satisfied by `values`, a literal-indexed
+# bytearray as in formula.Assignment. One gather and one segmented OR over
+# the flat literal array, so checking a model costs a few array passes.
+def falsified_clauses(formula, values):
+    lits, offsets = formula.as_numpy()
+    if not len(lits):
+        return list(range(len(formula)))
+    true = np.frombuffer(values, dtype=np.uint8) == TRUE
+    lengths = np.diff(offsets)
+    satisfied = np.zeros(len(formula), dtype=bool)
+    nonempty = lengths > 0
+    satisfied[nonempty] = np.logical_or.reduceat(true[lits], offsets[:-1][nonempty])
+    return np.flatnonzero(~satisfied).tolist()